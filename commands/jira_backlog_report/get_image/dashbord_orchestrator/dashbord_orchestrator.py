@@ -1,16 +1,17 @@
 import logging
 import os
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 
 from commands.jira_backlog_report.get_image.dashbord_orchestrator.phase1_environment import setup_environment, EnvironmentConfig, AuthContext
 from commands.jira_backlog_report.get_image.dashbord_orchestrator.phase2_metadata import get_jira_artifacts, JiraMetadata
 from commands.jira_backlog_report.get_image.dashbord_orchestrator.phase3_core_data import fetch_core_data, CoreData
-from commands.jira_backlog_report.get_image.dashbord_orchestrator.phase4_metrics import collect_metrics, MetricsCollection
+from commands.jira_backlog_report.get_image.dashbord_orchestrator.phase4_metrics import collect_metrics, prefetch_metric_counts, MetricsCollection
 from commands.jira_backlog_report.get_image.dashbord_orchestrator.phase5_summary import generate_ai_summary, AISummary
 from commands.jira_backlog_report.get_image.dashbord_orchestrator.phase6_dashboard import render_dashboard
 from commands.jira_backlog_report.get_image.dashbord_orchestrator.phase7_output import generate_all_outputs, OutputPaths
+from util.request_jira import RequestJiraRepository
 
 class DashboardOrchestrator:
     """ダッシュボード生成を統括するオーケストレーター"""
@@ -22,16 +23,22 @@ class DashboardOrchestrator:
         """
         self.enable_logging = enable_logging
     
-    def run(self, say) -> Path:
+    def run(self, say=None) -> Optional[bytes]:
         """
         全フェーズを実行してダッシュボードを生成
         
+        Args:
+            say: 進捗をSlackへ通知する関数（省略時は通知しない）
+        
         Returns:
-            Path: 生成した画像ファイルのパス
+            Optional[bytes]: 生成した画像(PNG)のバイト列。失敗時はNone
         
         Raises:
             OrchestratorError: いずれかのフェーズで失敗した場合
         """
+        if say is None:
+            # Slack以外(ローカル実行など)から呼ばれた場合は進捗通知を行わない
+            say = lambda message: None
         try:
             if self.enable_logging:
                 print("🚀 Dashboard generation started")
@@ -45,23 +52,43 @@ class DashboardOrchestrator:
             say("データを取得中")
             if self.enable_logging:
                 print("[Phase 2] Fetching Jira metadata")
-            jira_metadata = get_jira_artifacts()
-            
-            # Phase 3: コアデータ取得
-            if self.enable_logging:
-                print("[Phase 3] Fetching core data")
-            core_data = fetch_core_data(
-                jira_metadata,
-            )
+            # 認証・コネクションプールを全フェーズで共有する
+            request_jira_repository = RequestJiraRepository()
+            jira_metadata = get_jira_artifacts(request_jira_repository)
             
-            say("集計中")
-            # Phase 4: メトリクス収集
-            if self.enable_logging:
-                print("[Phase 4] Collecting metrics")
-            metrics = collect_metrics(
-                jira_metadata,
-                core_data,
-            )
+            # プロジェクト全体の件数は大規模プロジェクトほど重いため、不要なら取得しない
+            include_project_metrics = os.getenv("DASHBOARD_PROJECT_METRICS", "true").lower() not in ("0", "false", "no")
+            with ThreadPoolExecutor(max_workers=2) as prefetch_executor:
+                # Phase 4 のプロジェクト全体の件数は project_key だけで決まるため、Phase 3 と並行して取得しておく
+                prefetched_counts = (
+                    prefetch_metric_counts(
+                        jira_metadata,
+                        request_jira_repository,
+                        prefetch_executor,
+                    )
+                    if include_project_metrics
+                    else None
+                )
+                
+                # Phase 3: コアデータ取得
+                if self.enable_logging:
+                    print("[Phase 3] Fetching core data")
+                core_data = fetch_core_data(
+                    jira_metadata,
+                    request_jira_repository,
+                )
+                
+                say("集計中")
+                # Phase 4: メトリクス収集
+                if self.enable_logging:
+                    print("[Phase 4] Collecting metrics")
+                metrics = collect_metrics(
+                    jira_metadata,
+                    core_data,
+                    request_jira_repository,
+                    prefetched=prefetched_counts,
+                    include_project_metrics=include_project_metrics,
+                )
             
             say("AIによる要約を生成")
             # Phase 5: AI要約生成
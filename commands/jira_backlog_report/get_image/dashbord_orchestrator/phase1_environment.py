@@ -1,4 +1,5 @@
 """Phase 1: Environment and Authentication Setup"""
+import os
 from typing import Optional, Tuple
 from requests.auth import HTTPBasicAuth
 
@@ -20,8 +21,8 @@ def setup_environment() -> Tuple[EnvironmentConfig, AuthContext]:
     Raises:
         EnvironmentError: 必須環境変数が不足している場合
     """    
-    # 2. 設定の検証と構築
-    config = EnvironmentConfig.from_env()
+    # 2. 設定の検証と構築（環境変数は一度だけスナップショットして渡す）
+    config = EnvironmentConfig.from_env(os.environ.copy())
     if not config:
         raise EnvironmentError(
             "必須の環境変数が設定されていません。\n"
@@ -4,9 +4,12 @@ Phase 2: Jiraメタデータ取得
 """
 
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
 
 from commands.jira_backlog_report.get_image.dashbord_orchestrator.types import JiraMetadata, BoardMetadata, SprintMetadata
+from util import json_cache
 from util.request_jira import RequestJiraRepository
 
 logger = logging.getLogger(__name__)
@@ -17,16 +20,38 @@ class MetadataError(Exception):
     pass
 
 
-def get_jira_artifacts():
+def get_jira_artifacts(request_jira_repository: Optional[RequestJiraRepository] = None):
     """
     Jiraからボード、スプリント、プロジェクトキー、ストーリーポイントフィールドを取得する
+
+    Args:
+        request_jira_repository: 共有するJiraリポジトリ（省略時は新規に生成）
     """
     try:
         
-        get_jira_data = RequestJiraRepository()
+        get_jira_data = request_jira_repository or RequestJiraRepository()
+
+        # ボード情報・SPフィールドIDはほぼ変わらないため、ディスクキャッシュを優先する
+        jira_domain = os.getenv("JIRA_DOMAIN", "")
+        try:
+            cache_ttl = int(os.getenv("JIRA_METADATA_CACHE_TTL", "86400"))
+        except ValueError:
+            cache_ttl = 86400
+        if os.getenv("JIRA_METADATA_CACHE_REFRESH", "").lower() in ("1", "true", "yes"):
+            cache_ttl = 0
+
+        # SPフィールドIDはボード/スプリントに依存しないため、先に別スレッドで解決を始める
+        sp_executor = ThreadPoolExecutor(max_workers=1)
+        sp_future = sp_executor.submit(_resolve_story_points_field, get_jira_data, jira_domain, cache_ttl)
+        sp_executor.shutdown(wait=False)
 
         # --- . 最初のScrumボードを探す ---
-        board_data = get_jira_data.get_scrum_board(1)
+        board_cache_key = (jira_domain, 1)
+        board_data = json_cache.load("jira_metadata_board", board_cache_key, cache_ttl)
+        if board_data is None:
+            board_data = get_jira_data.get_scrum_board(1)
+            if board_data:
+                json_cache.save("jira_metadata_board", board_cache_key, board_data)
         board_data["boards_count"] = 1
 
         print(f"  -> 発見: '{board_data.get('name')}' (ID: {board_data.get('id')})")
@@ -46,8 +71,7 @@ def get_jira_artifacts():
 
         # --- 5. ストーリーポイントフィールドIDを解決 ---
         print("🔎 ストーリーポイントフィールドIDを検索中...")
-        story_points_field_id = None
-        story_points_field_id = get_jira_data.get_story_point_field()
+        story_points_field_id = sp_future.result()
         
         if story_points_field_id:
             print(f"  -> 発見: {story_points_field_id}")
@@ -70,4 +94,22 @@ def get_jira_artifacts():
         return None
     except Exception as e:
         print(f"❌ 予期せぬエラーが発生しました: {e}")
-        return None        
\ No newline at end of file
+        return None        
+
+
+def _resolve_story_points_field(
+    get_jira_data: RequestJiraRepository,
+    jira_domain: str,
+    cache_ttl: int,
+) -> Optional[str]:
+    """ストーリーポイントのフィールドIDを、環境変数→ディスクキャッシュ→Jira の順に解決する"""
+    # 環境変数での明示指定は、過去に自動検出してキャッシュした値より常に優先する
+    sp_env = getattr(get_jira_data, "sp_env", None)
+    if sp_env:
+        return sp_env
+    story_points_field_id = json_cache.load("jira_metadata_sp_field", jira_domain, cache_ttl)
+    if story_points_field_id is None:
+        story_points_field_id = get_jira_data.get_story_point_field()
+        if story_points_field_id:
+            json_cache.save("jira_metadata_sp_field", jira_domain, story_points_field_id)
+    return story_points_field_id
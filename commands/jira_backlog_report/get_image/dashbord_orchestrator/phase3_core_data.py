@@ -4,6 +4,10 @@ Phase 3: コアデータ取得
 """
 
 import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from typing import List, Optional, Dict, Any
 
 
@@ -20,6 +24,26 @@ from util.request_jira import RequestJiraRepository
 
 
 
+# changelog から開始/完了時刻を判定するステータス名（大文字小文字・区切り文字の揺れを1回の照合で吸収する）
+_START_STATUS_RE = re.compile(
+    r"(?:in[ _-]?progress|doing|進行中|作業中|対応中|in[ _-]?review|review|レビュー|qa)",
+    re.IGNORECASE,
+)
+
+_DONE_STATUS_RE = re.compile(
+    r"(?:done|closed|resolved|完了)",
+    re.IGNORECASE,
+)
+
+
+# changelog の並べ替えキー（ラムダより速い C 実装の itemgetter を使う）
+_get_created = itemgetter("created")
+
+
+def _get_created_or_empty(history: Dict[str, Any]) -> str:
+    return history.get("created") or ""
+
+
 class CoreDataError(Exception):
     """コアデータ取得時のエラー"""
     pass
@@ -27,6 +51,7 @@ class CoreDataError(Exception):
 
 def fetch_core_data(
     metadata: JiraMetadata,
+    request_jira_repository: Optional[RequestJiraRepository] = None,
 ) -> CoreData:
     # """
     # スプリント内のサブタスクデータを取得する。
@@ -64,8 +89,17 @@ def fetch_core_data(
         # )
         jql_query = f"sprint = {sprint_id} AND type not in subTaskIssueTypes()"
         fields = ["summary", "issuetype", "status", "subtasks", "assignee"]
-        request_jira_repository = RequestJiraRepository()
-        searched_issues = request_jira_repository.request_jql(jql_query, fields=fields)
+        # 呼び出し元から渡された接続を使い回す（未指定時のみ生成）
+        request_jira_repository = request_jira_repository or RequestJiraRepository()
+        # 親タスクは少数のフィールドしか使わないため、大きなページで往復回数を抑える
+        try:
+            page_size = max(1, int(os.getenv("JIRA_PAGE_SIZE", "1000")))
+        except ValueError:
+            page_size = 1000
+        try:
+            searched_issues = list(request_jira_repository.iter_jql(jql_query, fields=fields, batch=page_size))
+        except Exception as e:
+            raise CoreDataError(f"親タスク取得に失敗しました: {e}") from e
         # print(searched_issues)
         # searched_result = searched_issues[0].raw.get("issues", [])
         
@@ -79,75 +113,68 @@ def fetch_core_data(
         parents_with_subtasks: List[ParentTask] = []
         total_subtasks = 0
         total_done = 0
-        
-        for issue in searched_issues:
-            # parent_issue = issue.raw.get("issues", [])
-            parent_issue = issue.raw
+
+        query_fields = [
+            "summary",
+            "status",
+            "assignee",
+            "issuetype",
+            "created",
+            "resolutiondate",
+            "priority",
+            "duedate",
+            metadata.story_points_field,
+        ]
+
+        # サブタスクを持つ親タスクと、取得対象のサブタスクキーを先に集める
+        parent_rows = []
+        subtask_keys: List[str] = []
+        for parent_issue in searched_issues:
             fields = parent_issue.get("fields", {})
             subtasks = fields.get("subtasks", [])
             # サブタスクがなければ処理を終了
             if not subtasks:
                 continue
+            parent_rows.append((parent_issue, fields, subtasks))
+            subtask_keys.extend(st.get("key") or st.get("id") for st in subtasks)
 
-            parent_key = parent_issue.get("key", "")
-            parent_summary = fields.get("summary", "")
+        # 同じサブタスクが複数の親に現れても1回だけ取得する（順序は保つ）
+        subtask_keys = list(dict.fromkeys(key for key in subtask_keys if key))
+
+        # サブタスクごとに課題を取得せず、key in (...) でまとめて取得する
+        # まず changelog なしで取得し、完了済みで resolutiondate を持つものは changelog を省略する
+        subtask_details = _fetch_subtask_details(request_jira_repository, subtask_keys, query_fields)
+        changelog_keys = [
+            key for key, issue in subtask_details.items()
+            if not _has_resolved_completion(issue.get("fields", {}))
+        ]
+        subtask_details.update(
+            _fetch_subtask_details(request_jira_repository, changelog_keys, query_fields, expand="changelog")
+        )
+        # 2回目の一括取得に失敗したチャンクは changelog のない1回目の結果が残るため、個別に取り直す
+        for key in changelog_keys:
+            if "changelog" not in subtask_details[key]:
+                subtask = request_jira_repository.get_issue(key, fields=query_fields, expand="changelog")
+                subtask_details[key] = subtask.raw
+
+        for parent_issue, fields, subtasks in parent_rows:
             parent_assignee = (fields.get("assignee") or {}).get("displayName")
             
             # try:
             subtask_list = []
             for subtask_raw in subtasks:
-                subtask_id = subtask_raw.get("id") or subtask_raw.get("key")
-                query_fields = [
-                    "summary",
-                    "status",
-                    "assignee",
-                    "issuetype",
-                    "created",
-                    "resolutiondate",
-                    "priority",
-                    "duedate",
-                    metadata.story_points_field,
-                ]
-                subtask = request_jira_repository.get_issue(subtask_id, fields=query_fields,expand="changelog")
-                subtask_issue = subtask.raw
-                # print(subtask_issue)
-                subtask_fields = subtask_issue.get("fields", {})
-                subtask_key = subtask_issue.get("key", subtask_id)
-                subtask_summary = subtask_fields.get("summary", "")
-                subtask_status = subtask_fields.get("status", {})
-                subtask_status_name = subtask_status.get("name", "")
-                # 完了判定
-                subtask_is_done = _is_status_done(subtask_status)
-                subtasks_changelog = subtask_issue.get("changelog", {}).get("histories", [])
-                started_at, completed_at = _extract_times_from_changelog(subtasks_changelog)
-
-                
-                # 担当者
-                subtask_assignee = (subtask_fields.get("assignee") or {}).get("displayName") or parent_assignee
-                
-                # ストーリーポイント
-                subtask_sp_raw = subtask_fields.get(metadata.story_points_field)
-                subtask_story_points = float(subtask_sp_raw) if isinstance(subtask_sp_raw, (int, float)) else 1.0
-                # 日時情報
-                subtask_created = subtask_fields.get("created")
-                subtask_resolution_date = subtask_fields.get("resolutiondate")
-                subtask_priority_name = (subtask_fields.get("priority") or {}).get("name")
-                subtask_due_date = subtask_fields.get("duedate")
-                # assignee_obj = getattr(subtask_fields, 'assignee', None)
-                
+                subtask_id = subtask_raw.get("key") or subtask_raw.get("id")
+                subtask_issue = subtask_details.get(subtask_id)
+                if subtask_issue is None:
+                    # 一括取得で見つからなかった場合のみ個別に取得する
+                    subtask = request_jira_repository.get_issue(subtask_id, fields=query_fields, expand="changelog")
+                    subtask_issue = subtask_details[subtask_id] = subtask.raw
                 subtask_list.append(
-                    SubtaskData(
-                        key=subtask_key,
-                        summary=subtask_summary,
-                        status=subtask_status_name,
-                        done=subtask_is_done,
-                        assignee=subtask_assignee,
-                        priority=subtask_priority_name,
-                        story_points=subtask_story_points,
-                        created=subtask_created,
-                        started_at=started_at,
-                        completed_at=completed_at,
-                        due_date=subtask_due_date,
+                    _build_subtask_data(
+                        subtask_issue,
+                        subtask_id,
+                        parent_assignee,
+                        metadata.story_points_field,
                     )
                 )
             parent_assignee_obj = fields.get("assignee")
@@ -197,6 +224,117 @@ def fetch_core_data(
     #     raise CoreDataError(f"予期しないエラーが発生しました: {str(e)}") from e
 
 
+def _fetch_subtask_details(
+    request_jira_repository: RequestJiraRepository,
+    subtask_keys: List[str],
+    query_fields: List[str],
+    chunk_size: int = 80,
+    expand: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    サブタスクの詳細を key in (...) の検索でまとめて取得する。
+    
+    Args:
+        request_jira_repository: Jiraリポジトリ
+        subtask_keys: 取得するサブタスクのキー
+        query_fields: 取得するフィールド
+        chunk_size: 1回のJQLに含めるキー数（JQLの長さ制限対策）
+        expand: 展開する項目（changelog が必要な場合は "changelog"）
+    
+    Returns:
+        課題キー -> 課題の生データ のマップ（取得できなかったものは含まない）
+    """
+    def _fetch_chunk(chunk: List[str]) -> List[Dict[str, Any]]:
+        jql = f"key in ({', '.join(chunk)})"
+        try:
+            return list(request_jira_repository.iter_jql(jql, fields=query_fields, expand=expand))
+        except Exception as e:
+            print(f"[Phase 3] サブタスクの一括取得に失敗しました: {e}")
+            return []
+
+    chunks = [subtask_keys[start:start + chunk_size] for start in range(0, len(subtask_keys), chunk_size)]
+    if not chunks:
+        return {}
+
+    # チャンク同士は独立しているため並列に取得する（ネットワーク待ちが支配的）
+    try:
+        max_workers = max(1, int(os.getenv("JIRA_SUBTASK_WORKERS", "12")))
+    except ValueError:
+        max_workers = 12
+
+    details: Dict[str, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        for issues in executor.map(_fetch_chunk, chunks):
+            for issue in issues:
+                details[issue.get("key")] = issue
+    return details
+
+
+def _build_subtask_data(
+    subtask_issue: Dict[str, Any],
+    subtask_id: str,
+    parent_assignee: Optional[str],
+    story_points_field: str,
+) -> SubtaskData:
+    """
+    サブタスクの生データから SubtaskData を構築する。
+    
+    Args:
+        subtask_issue: サブタスクの生データ（changelog含む）
+        subtask_id: サブタスクのキーまたはID
+        parent_assignee: 親タスクの担当者（サブタスク未割り当て時に使用）
+        story_points_field: ストーリーポイントのフィールドID
+    
+    Returns:
+        SubtaskData
+    """
+    subtask_fields = subtask_issue.get("fields", {})
+    subtask_key = subtask_issue.get("key", subtask_id)
+    subtask_summary = subtask_fields.get("summary", "")
+    subtask_status = subtask_fields.get("status", {})
+    subtask_status_name = subtask_status.get("name", "")
+    # 完了判定
+    subtask_is_done = _is_status_done(subtask_status)
+    if "changelog" in subtask_issue:
+        subtasks_changelog = subtask_issue["changelog"].get("histories", [])
+        started_at, completed_at = _extract_times_from_changelog(subtasks_changelog)
+    else:
+        # changelog を省略した完了済みサブタスクは resolutiondate を完了時刻とする
+        started_at = None
+        completed_at = subtask_fields.get("resolutiondate") if subtask_is_done else None
+
+    # 担当者
+    subtask_own_assignee = (subtask_fields.get("assignee") or {}).get("displayName")
+    subtask_assignee = subtask_own_assignee or parent_assignee
+    
+    # ストーリーポイント
+    subtask_sp_raw = subtask_fields.get(story_points_field)
+    try:
+        subtask_story_points = float(subtask_sp_raw)
+    except (TypeError, ValueError):
+        subtask_story_points = 1.0
+    # 日時情報
+    subtask_created = subtask_fields.get("created")
+    subtask_priority_name = (subtask_fields.get("priority") or {}).get("name")
+    subtask_due_date = subtask_fields.get("duedate")
+    
+    return SubtaskData(
+        key=subtask_key,
+        summary=subtask_summary,
+        status=subtask_status_name,
+        done=subtask_is_done,
+        assignee=subtask_assignee,
+        priority=subtask_priority_name,
+        story_points=subtask_story_points,
+        created=subtask_created,
+        started_at=started_at,
+        completed_at=completed_at,
+        due_date=subtask_due_date,
+        status_category=(subtask_status.get("statusCategory") or {}).get("key"),
+        unassigned=not subtask_fields.get("assignee"),
+    )
+
+
 def _is_status_done(status: Optional[Dict[str, Any]]) -> bool:
     """
     ステータスが完了状態かどうかを判定する。
@@ -215,6 +353,18 @@ def _is_status_done(status: Optional[Dict[str, Any]]) -> bool:
     
     return key == "done"
 
+def _has_resolved_completion(fields: Dict[str, Any]) -> bool:
+    """
+    完了済みかつ resolutiondate を持つ（changelog を読まなくてよい）サブタスクかどうかを判定する。
+    
+    Args:
+        fields: サブタスクのフィールド
+    
+    Returns:
+        changelog の取得を省略できるならTrue
+    """
+    return _is_status_done(fields.get("status")) and bool(fields.get("resolutiondate"))
+
 def _extract_times_from_changelog(
     changelog: Dict[str, Any]
 ) -> tuple[Optional[str], Optional[str]]:
@@ -238,22 +388,17 @@ def _extract_times_from_changelog(
     # if not histories:
     #     return None, None
     
-    # 作成日時でソート
+    # 作成日時でソート（Jiraは通常昇順で返すため、順序が崩れている場合のみ並べ替える）
     try:
-        histories.sort(key=lambda h: h.get("created", ""))
+        created = list(map(_get_created, histories))
+        if any(a > b for a, b in zip(created, created[1:])):
+            histories = sorted(histories, key=_get_created)
+    except (KeyError, TypeError):
+        # created のない（または null の）履歴が混ざる場合は空文字扱いで並べ替える
+        histories = sorted(histories, key=_get_created_or_empty)
     except Exception:
         pass
     
-    # 開始状態と完了状態を定義
-    start_statuses = {
-        "in progress", "in_progress", "doing", "進行中", "作業中", "対応中",
-        "in review", "review", "レビュー", "qa"
-    }
-    
-    done_statuses = {
-        "done", "closed", "resolved", "完了"
-    }
-    
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     
@@ -264,19 +409,16 @@ def _extract_times_from_changelog(
             if (item.get("field") or "").lower() != "status":
                 continue
             
-            to_status = str(item.get("toString", "")).strip().lower()
-            to_status_normalized = to_status.replace(" ", "_").replace("-", "_")
+            to_status = (item.get("toString") or "").strip()
             timestamp = history.get("created")
             
             # 開始時刻の判定
-            if not started_at:
-                if to_status_normalized in start_statuses or to_status in start_statuses:
-                    started_at = timestamp
+            if not started_at and _START_STATUS_RE.fullmatch(to_status):
+                started_at = timestamp
             
             # 完了時刻の判定
-            if not completed_at:
-                if to_status_normalized in done_statuses or to_status in done_statuses:
-                    completed_at = timestamp
+            if not completed_at and _DONE_STATUS_RE.fullmatch(to_status):
+                completed_at = timestamp
             
             if started_at and completed_at:
                 break
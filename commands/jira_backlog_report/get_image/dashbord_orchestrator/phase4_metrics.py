@@ -5,12 +5,18 @@ Phase 4: メトリクス収集
 
 import logging
 import os
+import threading
+import time
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta, timezone, date
-from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Sequence, Tuple, TYPE_CHECKING
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
 
 
+from util import json_cache
 from util.request_jira import RequestJiraRepository
 from commands.jira_backlog_report.get_image.dashbord_orchestrator.types import AuthContext, JiraMetadata, CoreData, MetricsCollection
 
@@ -19,24 +25,50 @@ logger = logging.getLogger(__name__)
 
 JST = timezone(timedelta(hours=9))
 
+# JQLテンプレート（スコープ部分は全クエリ共通）
+_PROJECT_SUBTASK_JQL = "project={project_key} AND type in subTaskIssueTypes()"
+_NOT_DONE_JQL = "statusCategory != \"Done\""
+_PROJECT_OPEN_JQL = f"{_PROJECT_SUBTASK_JQL} AND {_NOT_DONE_JQL}"
+
 
 class MetricsError(Exception):
     """メトリクス収集時のエラー"""
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MetricQuery:
-    """メトリクスクエリの定義"""
+    """メトリクスクエリの定義（_build_metric_queries でキャッシュして共有するため不変にする）"""
     name: str
     jql: str
     description: str
 
 
+@dataclass(slots=True)
+class MetricsCounts:
+    """
+    件数系メトリクスの集計結果。
+    
+    project_* は MetricQuery.name と同名のフィールドで、件数クエリの結果をそのまま設定する。
+    それ以外はスプリント内のサブタスクから数える（_count_sprint_subtask_risks）。
+    """
+    project_total: int = 0
+    project_open: int = 0
+    overdue: int = 0
+    due_soon: int = 0
+    high_priority_todo: int = 0
+    unassigned: int = 0
+
+
 def collect_metrics(
     metadata: JiraMetadata,
     core_data: CoreData,
+    request_jira_repository: Optional[RequestJiraRepository] = None,
+    prefetched: Optional[Dict[str, "Future[int]"]] = None,
+    include_project_metrics: bool = True,
 ) -> MetricsCollection:
+    # include_project_metrics: プロジェクト全体の件数(projectTotal/projectOpenTotal)を取得するか。
+    #     False の場合はクエリを発行せず 0 とする
     # """
     # 各種メトリクスを並列で収集する。
     
@@ -55,22 +87,17 @@ def collect_metrics(
     
     # try:
 
+        # 呼び出し元から渡された接続を全クエリで共有する（未指定時のみ生成）
+        request_jira = request_jira_repository or RequestJiraRepository()
+
         # print(metadata.sprint)
-        sprint_id = metadata.sprint["id"]
         project_key = metadata.project_key
         
-        # メトリクスクエリを定義
-        queries = _build_metric_queries(sprint_id, project_key)
-
-        
-        # 並列実行
-        results = _execute_queries_parallel(queries)
-        
-        # 結果を集約
-        metrics = _aggregate_metrics(results, core_data)
+        # メトリクスクエリを定義（プロジェクト全体の件数を表示しない場合はクエリを発行しない）
+        queries = _build_metric_queries(project_key) if include_project_metrics else ()
 
         # Time-in-Status (cycle time) 計算
-        # try:
+        # 件数クエリとは依存関係がないため、別スレッドで並行して開始しておく
         scope = os.getenv("TIS_SCOPE", "sprint")
         unit = os.getenv("TIS_UNIT", "days")
         
@@ -79,11 +106,52 @@ def collect_metrics(
             scope,
             unit,
         )
-        metrics.time_in_status = _calculate_time_in_status(
-            metadata,
-            unit=unit,
-            scope=scope,
-        )
+        hv_sample_limit_raw = os.getenv("HISTORICAL_VELOCITY_SAMPLE_LIMIT", "6")
+        try:
+            hv_sample_limit = max(1, min(20, int(hv_sample_limit_raw)))
+        except ValueError:
+            hv_sample_limit = 6
+        # Time-in-Status と Historical Velocity はどちらも件数クエリ・他の集計と独立しているため、
+        # 同じプールで先に投入し、件数の待ち合わせや集計と重ねて実行する
+        with ThreadPoolExecutor(max_workers=2) as side_executor:
+            tis_future = side_executor.submit(
+                _calculate_time_in_status,
+                metadata,
+                request_jira,
+                unit=unit,
+                scope=scope,
+            )
+            hist_future = side_executor.submit(
+                _calculate_historical_velocity,
+                request_jira,
+                metadata.board["id"],
+                metadata.story_points_field,
+                sample_limit=hv_sample_limit,
+            )
+            # 並列実行（プロジェクト全体の件数。prefetch_metric_counts で先行実行済みの分は結果を待つだけ）
+            counts = _execute_queries_parallel(queries, request_jira, prefetched)
+            # スプリント内のリスク系件数は Phase 3 の取得結果から数える（JQLは発行しない）
+            _count_sprint_subtask_risks(core_data, counts)
+            
+            # Velocity と担当者別ワークロードはサブタスクを1回走査してまとめて集計する
+            velocity, assignee_workload = _aggregate_core(core_data)
+
+            # 結果を集約
+            metrics = _aggregate_metrics(counts, core_data, assignee_workload)
+
+            # ステータス分布（Phase 3 の取得結果からクライアント側で集計）
+            try:
+                metrics.status_counts = _calculate_status_counts(core_data)
+            except Exception as sce:  # pragma: no cover
+                print(f"ステータス分布の集計でエラー: {sce}")
+
+            metrics.time_in_status = tis_future.result()
+            try:
+                hist = hist_future.result()
+            except Exception as hve:  # pragma: no cover
+                print(f"Historical Velocity計算でエラー: {hve}")
+                hist = None
+
         # print(metrics)
         if metrics.time_in_status:
             total_statuses = len(metrics.time_in_status.get("totalByStatus") or {})
@@ -99,32 +167,15 @@ def collect_metrics(
         #     print(f"Time-in-status計算でエラー: {tis_error}")
 
         # 追加: Velocity / Evidence (Burndown削除)
-        # Velocity
-        try:
-            velocity = _calculate_velocity(core_data)
-            metrics.velocity = velocity
-        except Exception as ve:  # pragma: no cover
-            print(f"Velocity計算でエラー: {ve}")
+        # Velocity（_aggregate_core で集計済み）
+        metrics.velocity = velocity
 
-        # Historical Velocity
-        try:
-            hv_sample_limit_raw = os.getenv("HISTORICAL_VELOCITY_SAMPLE_LIMIT", "6")
-            try:
-                hv_sample_limit = max(1, min(20, int(hv_sample_limit_raw)))
-            except ValueError:
-                hv_sample_limit = 6
-            hist = _calculate_historical_velocity(
-                metadata.board["id"],
-                metadata.story_points_field,
-                sample_limit=hv_sample_limit,
-            )
-            if hist and metrics.velocity is not None:
-                metrics.velocity["historical"] = hist
-        except Exception as hve:  # pragma: no cover
-            print(f"Historical Velocity計算でエラー: {hve}")
+        # Historical Velocity（件数クエリと並行して取得済み）
+        if hist and metrics.velocity is not None:
+            metrics.velocity["historical"] = hist
 
         try:
-            evidence = _extract_evidence(core_data, results, metadata, top_n=5)
+            evidence = _extract_evidence(core_data, counts, metadata, top_n=5)
             metrics.evidence = evidence
             
         except Exception as ee:  # pragma: no cover
@@ -139,170 +190,282 @@ def collect_metrics(
     #     raise MetricsError(f"予期しないエラーが発生しました: {str(e)}") from e
 
 
-def _build_metric_queries(
-    sprint_id: int,
-    project_key: str
-) -> List[MetricQuery]:
-    """
-    メトリクスクエリのリストを構築する。
-    
-    Args:
-        sprint_id: スプリントID
-        project_key: プロジェクトキー
-    
-    Returns:
-        List[MetricQuery]: クエリのリスト
-    """
-    
-    # 高優先度のタスク
+def _parse_high_priorities() -> Tuple[str, ...]:
+    """環境変数 HIGH_PRIORITIES から高優先度とみなす優先度名の一覧を取得する。"""
     high_priorities = os.getenv("HIGH_PRIORITIES", "Highest,High")
-    pri_list = ",".join([f'"{p.strip()}"' for p in high_priorities.split(",") if p.strip()])
-    
-    # 期限間近の日数
+    return tuple(p.strip() for p in high_priorities.split(",") if p.strip())
+
+
+def _parse_due_soon_days() -> int:
+    """環境変数 DUE_SOON_DAYS から期限間近とみなす日数を取得する。"""
     due_soon_days_raw = os.getenv("DUE_SOON_DAYS", "7")
     try:
-        due_soon_days_val = int(due_soon_days_raw)
+        return int(due_soon_days_raw)
     except (TypeError, ValueError):
         print("DUE_SOON_DAYS の値 '%s' を整数に変換できませんでした。デフォルトの 7 を使用します", due_soon_days_raw)
-        due_soon_days_val = 7
+        return 7
 
-    if due_soon_days_val > 0:
-        due_soon_offset = f"+{due_soon_days_val}d"
-    elif due_soon_days_val < 0:
-        due_soon_offset = f"{due_soon_days_val}d"
-    else:
-        due_soon_offset = "0d"
+
+def _parse_count_cache_ttl() -> int:
+    """環境変数 JIRA_COUNT_CACHE_TTL から件数キャッシュの有効期間(秒)を取得する。"""
+    if os.getenv("JIRA_COUNT_CACHE_REFRESH", "").lower() in ("1", "true", "yes"):
+        return 0
+    try:
+        return int(os.getenv("JIRA_COUNT_CACHE_TTL", "120"))
+    except ValueError:
+        return 120
+
+
+# 環境変数はモジュール読み込み時に一度だけ解釈する（変更を反映する場合は _refresh_env を呼ぶ）
+HIGH_PRIORITIES: Tuple[str, ...] = _parse_high_priorities()
+DUE_SOON_DAYS: int = _parse_due_soon_days()
+COUNT_CACHE_TTL: int = _parse_count_cache_ttl()
+
+# 件数のプロセス内キャッシュ: (ドメイン, 正規化済みJQL) -> (保存時刻(monotonic), 件数)
+# 件数クエリは複数スレッドから同時に実行されるため、ロックで保護する
+_COUNT_CACHE: Dict[Tuple[str, str], Tuple[float, int]] = {}
+_COUNT_CACHE_LOCK = threading.Lock()
+
+
+def _refresh_env() -> None:
+    """環境変数由来の設定を読み直し、組み立て済みのクエリを破棄する。"""
+    global HIGH_PRIORITIES, DUE_SOON_DAYS, COUNT_CACHE_TTL
+    HIGH_PRIORITIES = _parse_high_priorities()
+    DUE_SOON_DAYS = _parse_due_soon_days()
+    COUNT_CACHE_TTL = _parse_count_cache_ttl()
+    _build_metric_queries.cache_clear()
+
+
+@lru_cache(maxsize=32)
+def _build_metric_queries(project_key: str) -> Tuple[MetricQuery, ...]:
+    """
+    メトリクスクエリの一覧を構築する（同じ引数では組み立て済みの結果を返す）。
+
+    スプリント内の件数(期限切れ・期限間近・高優先度未着手・未割り当て)は
+    _count_sprint_subtask_risks で1回の取得から数えるため、ここではプロジェクト全体の件数のみを扱う。
+    プロジェクト全体のクエリはスプリントに依存しないため、スプリントが替わってもキャッシュを使い回せる。
     
-    queries = [
-        # 1. 期限切れサブタスク
-        MetricQuery(
-            name="overdue",
-            jql=f"Sprint={sprint_id} AND type in subTaskIssueTypes() AND duedate < endOfDay() AND statusCategory != \"Done\"",
-            description="期限切れのサブタスク"
-        ),
-        
-        # 2. 期限間近サブタスク
-        MetricQuery(
-            name="due_soon",
-            jql=(
-                "Sprint={sprint_id} AND type in subTaskIssueTypes() AND "
-                "duedate >= startOfDay() AND "
-                "duedate <= endOfDay(\"{offset}\") AND "
-                "statusCategory != \"Done\""
-            ).format(sprint_id=sprint_id, offset=due_soon_offset),
-            description="期限間近のサブタスク"
-        ),
-        
-        # 3. 高優先度の未着手サブタスク
-        MetricQuery(
-            name="high_priority_todo",
-            jql=f"Sprint={sprint_id} AND type in subTaskIssueTypes() AND priority in ({pri_list}) AND statusCategory = \"To Do\"",
-            description="高優先度の未着手サブタスク"
-        ),
-        
-        # 4. 未割り当てサブタスク
-        MetricQuery(
-            name="unassigned",
-            jql=f"Sprint={sprint_id} AND type in subTaskIssueTypes() AND assignee is EMPTY AND statusCategory != \"Done\"",
-            description="未割り当てのサブタスク"
-        ),
-        
-        # 5. プロジェクト全体のサブタスク数
+    Args:
+        project_key: プロジェクトキー
+    
+    Returns:
+        Tuple[MetricQuery, ...]: クエリの一覧
+    """
+    return (
+        # 1. プロジェクト全体のサブタスク数
         MetricQuery(
             name="project_total",
-            jql=f"project={project_key} AND type in subTaskIssueTypes()",
+            jql=_PROJECT_SUBTASK_JQL.format(project_key=project_key),
             description="プロジェクト全体のサブタスク数"
         ),
         
-        # 6. プロジェクトの未完了サブタスク数
+        # 2. プロジェクトの未完了サブタスク数
         MetricQuery(
             name="project_open",
-            jql=f"project={project_key} AND type in subTaskIssueTypes() AND statusCategory != \"Done\"",
+            jql=_PROJECT_OPEN_JQL.format(project_key=project_key),
             description="プロジェクトの未完了サブタスク数"
         ),
-    ]
+    )
+
+
+def _count_sprint_subtask_risks(core_data: CoreData, counts: MetricsCounts) -> None:
+    """
+    スプリント内サブタスクのリスク系の件数を、Phase 3 で取得済みのデータから数える。
+
+    スコープ(スプリント内のサブタスク)は Phase 3 の取得結果と同じため、JQLを発行せずに以下の条件を判定する。
+    - overdue: 期日が今日以前 かつ 未完了
+    - due_soon: 期日が今日〜DUE_SOON_DAYS日後 かつ 未完了
+    - high_priority_todo: 優先度が HIGH_PRIORITIES に含まれる かつ ステータスカテゴリが To Do
+    - unassigned: 担当者なし かつ 未完了
+    
+    Args:
+        core_data: コアデータ
+        counts: 結果を書き込む集計結果（overdue / due_soon / high_priority_todo / unassigned を上書きする）
+    """
+    overdue = due_soon = high_priority_todo = unassigned = 0
+    # JQL の priority in (...) と同様に大文字小文字を区別しない
+    high_priorities = {p.casefold() for p in HIGH_PRIORITIES}
+    today = datetime.now(JST).date()
+    due_soon_until = today + timedelta(days=DUE_SOON_DAYS)
+
+    for parent in core_data.parents:
+        for st in parent.subtasks:
+            if st.done:
+                continue
+            due_raw = st.due_date
+            if due_raw:
+                try:
+                    due = date.fromisoformat(due_raw[:10])
+                except ValueError:
+                    due = None
+                if due is not None:
+                    if due <= today:
+                        overdue += 1
+                    if today <= due <= due_soon_until:
+                        due_soon += 1
+            if st.status_category == "new" and (st.priority or "").casefold() in high_priorities:
+                high_priority_todo += 1
+            if st.unassigned:
+                unassigned += 1
+
+    counts.overdue = overdue
+    counts.due_soon = due_soon
+    counts.high_priority_todo = high_priority_todo
+    counts.unassigned = unassigned
+    print(f"  期限切れのサブタスク: {overdue} 件")
+    print(f"  期限間近のサブタスク: {due_soon} 件")
+    print(f"  高優先度の未着手サブタスク: {high_priority_todo} 件")
+    print(f"  未割り当てのサブタスク: {unassigned} 件")
+
+
+def prefetch_metric_counts(
+    metadata: JiraMetadata,
+    request_jira_repository: RequestJiraRepository,
+    executor: ThreadPoolExecutor,
+) -> Dict[str, "Future[int]"]:
+    """
+    プロジェクト全体の件数クエリを先行して投入する。
+    
+    これらのクエリは project_key だけで組み立てられるため、Phase 3 の取得と並行して実行できる。
+    戻り値は collect_metrics の prefetched 引数にそのまま渡す。
     
-    return queries
+    Args:
+        metadata: Jiraメタデータ
+        request_jira_repository: 共有するJiraリポジトリ
+        executor: クエリを実行するスレッドプール
+    
+    Returns:
+        Dict[str, Future[int]]: クエリ名 -> カウントのFuture のマップ
+    """
+    queries = _build_metric_queries(metadata.project_key)
+    return {
+        query.name: executor.submit(_execute_single_query, request_jira_repository, query)
+        for query in queries
+    }
 
 
 def _execute_queries_parallel(
-    queries: List[MetricQuery],
-) -> Dict[str, int]:
+    queries: Sequence[MetricQuery],
+    request_jira: RequestJiraRepository,
+    prefetched: Optional[Dict[str, "Future[int]"]] = None,
+) -> MetricsCounts:
     """
     クエリを並列実行してカウントを取得する。
     
     Args:
-        client: JiraClient
         queries: クエリのリスト
-        enable_logging: ログ出力を有効化するかどうか
+        request_jira: 共有するJiraリポジトリ
+        prefetched: 先行実行済みのクエリ名 -> Future（該当クエリは再実行しない）
     
     Returns:
-        Dict[str, int]: クエリ名 -> カウント のマップ
+        MetricsCounts: クエリ名と同名のフィールドにカウントを設定した集計結果
     """
-    results: Dict[str, int] = {}
+    results = MetricsCounts()
+    if not queries:
+        return results
     
-    # ThreadPoolExecutorで並列実行（最大6並列）
-    with ThreadPoolExecutor(max_workers=6) as executor:
-        # 各クエリを並列実行
+    prefetched = prefetched or {}
+    pending = [query for query in queries if query.name not in prefetched]
+    
+    # ThreadPoolExecutorで並列実行（最大6並列、未実行のクエリ数を超えるスレッドは作らない）
+    with ThreadPoolExecutor(max_workers=max(1, min(6, len(pending)))) as executor:
+        # 先行実行済みのFutureと、残りのクエリを並列実行したFutureをまとめて待つ
         future_to_query = {
-            executor.submit(_execute_single_query, query): query
+            prefetched[query.name]: query
             for query in queries
+            if query.name in prefetched
         }
+        future_to_query.update({
+            executor.submit(_execute_single_query, request_jira, query): query
+            for query in pending
+        })
         
         # 結果を収集
         for future in as_completed(future_to_query):
             query = future_to_query[future]
             try:
                 count = future.result()
-                results[query.name] = count
+                setattr(results, query.name, count)
                 
                 print(f"  {query.description}: {count} 件")
                     
             except Exception as e:
                 print(f"クエリ '{query.name}' の実行に失敗: {e}")
-                results[query.name] = 0
+                setattr(results, query.name, 0)
     
     return results
 
 
 def _execute_single_query(
+    request_jira: RequestJiraRepository,
     query: MetricQuery
 ) -> int:
     """
     単一のクエリを実行してカウントを取得する。
     
     Args:
-        client: JiraClient
+        request_jira: 共有するJiraリポジトリ
         query: メトリクスクエリ
     
     Returns:
         int: カウント
     """
-    # まずapproximate_countを試す
-    # code, count, error = client.count_jql(query.jql, batch=500)
-    request_jira = RequestJiraRepository()
-    issues = request_jira.request_jql(query=query.jql)
+    # 件数は数分単位でしか変わらないため、短時間の再実行ではキャッシュを使う
+    # （プロセス内のメモリ → ディスクの順に参照し、どちらも無ければJiraに問い合わせる）
+    cache_key = (os.getenv("JIRA_DOMAIN", ""), " ".join(query.jql.split()))
+    ttl = COUNT_CACHE_TTL
+    if ttl > 0:
+        with _COUNT_CACHE_LOCK:
+            entry = _COUNT_CACHE.get(cache_key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+
+    cached = json_cache.load("jql_count", cache_key, ttl)
+    if cached is not None:
+        return cached
+
+    count = request_jira.count_jql(query.jql)
 
-    count = issues.total
-    
     if count is not None:
+        if ttl > 0:
+            _store_count(cache_key, count)
+            json_cache.save("jql_count", cache_key, count)
         return count
     
     # 失敗した場合は0を返す
-    # print(f"クエリ実行失敗 ({query.name}): {error}")
+    print(f"クエリ実行失敗 ({query.name})")
     return 0
 
 
+def _store_count(cache_key: Tuple[str, str], count: int) -> None:
+    """件数をプロセス内キャッシュに保存する。"""
+    with _COUNT_CACHE_LOCK:
+        _COUNT_CACHE[cache_key] = (time.monotonic(), count)
+
+
+def invalidate_metrics_cache() -> None:
+    """
+    件数キャッシュ（メモリ・ディスクの両方）を破棄する。
+    
+    Jiraの課題を作成・更新した直後など、古い件数を返したくない場合に呼ぶ。
+    """
+    with _COUNT_CACHE_LOCK:
+        _COUNT_CACHE.clear()
+    json_cache.clear("jql_count")
+
+
 def _aggregate_metrics(
-    query_results: Dict[str, int],
-    core_data: CoreData
+    counts: MetricsCounts,
+    core_data: CoreData,
+    assignee_workload: Dict[str, Dict[str, Any]],
 ) -> MetricsCollection:
     """
     クエリ結果とコアデータからメトリクスを集約する。
     
     Args:
-        query_results: クエリ結果
+        counts: 件数系メトリクスの集計結果
         core_data: コアデータ
+        assignee_workload: 担当者別のワークロード（_aggregate_core の結果）
     
     Returns:
         MetricsCollection: 集約されたメトリクス
@@ -312,24 +475,21 @@ def _aggregate_metrics(
         "sprintTotal": core_data.totals.subtasks,
         "sprintDone": core_data.totals.done,
         "sprintOpen": core_data.totals.not_done,
-        "projectTotal": query_results.get("project_total", 0),
-        "projectOpenTotal": query_results.get("project_open", 0),
-        "overdue": query_results.get("overdue", 0),
-        "dueSoon": query_results.get("due_soon", 0),
-        "highPriorityTodo": query_results.get("high_priority_todo", 0),
-        "unassignedCount": query_results.get("unassigned", 0),
+        "projectTotal": counts.project_total,
+        "projectOpenTotal": counts.project_open,
+        "overdue": counts.overdue,
+        "dueSoon": counts.due_soon,
+        "highPriorityTodo": counts.high_priority_todo,
+        "unassignedCount": counts.unassigned,
     }
     
     # リスクデータ
     risks = {
-        "overdue": query_results.get("overdue", 0),
-        "dueSoon": query_results.get("due_soon", 0),
-        "highPriorityTodo": query_results.get("high_priority_todo", 0),
+        "overdue": counts.overdue,
+        "dueSoon": counts.due_soon,
+        "highPriorityTodo": counts.high_priority_todo,
     }
     
-    # 担当者別の集計
-    assignee_workload = _calculate_assignee_workload(core_data)
-    
     return MetricsCollection(
         kpis=kpis,
         risks=risks,
@@ -339,10 +499,13 @@ def _aggregate_metrics(
 
 def _normalize_story_points(value: Any, default_if_missing: float = 1.0) -> float:
     """Story Points を正規化する。未設定(None/非数値)は default_if_missing を返す。"""
-    sp: float
-    if isinstance(value, (int, float)):
-        sp = float(value)
-    elif value is None:
+    # 大半を占める float / int / None は厳密な型比較で先に処理する（isinstance より速い）
+    value_type = type(value)
+    if value_type is float:
+        return value if value >= 0 else 0.0
+    if value_type is int:
+        return float(value) if value >= 0 else 0.0
+    if value is None:
         sp = default_if_missing
     else:
         try:
@@ -356,24 +519,49 @@ def _normalize_story_points(value: Any, default_if_missing: float = 1.0) -> floa
 
 
 
-def _calculate_velocity(core_data: CoreData) -> Dict[str, Any]:
-    """Velocity(ストーリーポイント)を計算する。"""
+def _aggregate_core(core_data: CoreData) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Velocity(ストーリーポイント)と担当者別のワークロードを、サブタスクの1回の走査でまとめて計算する。
+    
+    Args:
+        core_data: コアデータ
+    
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]: (Velocity, 担当者名 -> ワークロード情報)
+    """
     planned = 0.0
     completed = 0.0
-    by_assignee: Dict[str, Dict[str, float]] = {}
+    by_assignee: Dict[str, Dict[str, float]] = defaultdict(
+        lambda: {"plannedSP": 0.0, "completedSP": 0.0}
+    )
+    workload: Dict[str, Dict[str, Any]] = defaultdict(
+        lambda: {"assignee": "", "subtasks": 0, "done": 0, "storyPoints": 0.0}
+    )
+    normalize = _normalize_story_points
+
     for parent in core_data.parents:
         for st in parent.subtasks:
-            sp = _normalize_story_points(st.story_points)
-            planned += sp
+            sp = normalize(st.story_points)
+            done = st.done
             assignee = st.assignee or "(未割り当て)"
-            if assignee not in by_assignee:
-                by_assignee[assignee] = {"plannedSP": 0.0, "completedSP": 0.0}
-            by_assignee[assignee]["plannedSP"] += sp
-            if st.done:
+
+            # Velocity
+            planned += sp
+            row = by_assignee[assignee]
+            row["plannedSP"] += sp
+            if done:
                 completed += sp
-                by_assignee[assignee]["completedSP"] += sp
+                row["completedSP"] += sp
+
+            # ワークロード
+            entry = workload[assignee]
+            entry["assignee"] = assignee
+            entry["subtasks"] += 1
+            entry["storyPoints"] += sp
+            entry["done"] += bool(done)
+
     completion_rate = completed / planned if planned > 0 else 0.0
-    return {
+    velocity = {
         "plannedSP": round(planned, 2),
         "completedSP": round(completed, 2),
         "completionRate": completion_rate,
@@ -386,12 +574,47 @@ def _calculate_velocity(core_data: CoreData) -> Dict[str, Any]:
             for k, v in by_assignee.items()
         }
     }
+    return velocity, dict(workload)
+
+def _calculate_status_counts(core_data: CoreData) -> Dict[str, Any]:
+    """スプリント内サブタスクのステータス別件数を集計する。
+
+    ステータスごとにJQLを発行せず、Phase 3 で取得済みのサブタスクを1回走査して数える。
+    出力: total / byStatus[{status,count}] (件数降順)
+    """
+    counts = Counter(
+        st.status or "(不明)"
+        for parent in core_data.parents
+        for st in parent.subtasks
+    )
+    by_status = [
+        {"status": name, "count": cnt}
+        for name, cnt in counts.most_common()
+    ]
+    return {
+        "total": sum(counts.values()),
+        "byStatus": by_status,
+    }
 
 
 ## Burndown機能は削除されました（_calculate_burndown 関数は存在しません）
 
 
-def _extract_evidence(core_data: CoreData, query_results: Dict[str, int], metadata: JiraMetadata, top_n: int = 5) -> Optional[List[Dict[str, Any]]]:
+# エビデンスで「高優先度」とみなす優先度名（小文字）
+_EVIDENCE_HIGH_PRIORITIES = frozenset({"highest", "high"})
+
+# エビデンスの並び順に使う優先度の重み（小文字の優先度名 -> 重み。未定義は 0.2）
+_EVIDENCE_PRIORITY_WEIGHTS = {
+    "highest": 1.0,
+    "high": 0.8,
+    "medium": 0.4,
+}
+
+# (スコア, エビデンス) の組からスコアを取り出すキー関数
+_get_score = itemgetter(0)
+
+
+def _extract_evidence(core_data: CoreData, counts: MetricsCounts, metadata: JiraMetadata, top_n: int = 5) -> Optional[List[Dict[str, Any]]]:
     """重要エビデンスを抽出する。ダッシュボード/Markdown双方で見やすい情報を付与する。"""
 
     def _calc_age_days(created: Optional[str]) -> Optional[float]:
@@ -467,28 +690,50 @@ def _extract_evidence(core_data: CoreData, query_results: Dict[str, int], metada
             return "担当未設定"
         return "要注視"
 
-    evidence: List[Dict[str, Any]] = []
+    # (type, key) ごとに (並び順のスコア, エビデンス) を1件だけ保持する
+    # （先に見つかったものを優先し、後段の重複除去を不要にする）
+    evidence: Dict[tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
 
     for parent in core_data.parents:
         for st in parent.subtasks:
             if st.done:
                 continue
 
+            # 優先度名の正規化はサブタスクごとに1回だけ行い、判定とスコアで使い回す
+            priority = st.priority
+            priority_norm = priority.strip().lower() if priority else ""
+            item_types: List[str] = []
+            if priority_norm in _EVIDENCE_HIGH_PRIORITIES:
+                item_types.append("highPriorityNotDone")
+            if not st.assignee:
+                item_types.append("unassigned")
+            # どちらにも該当しないサブタスクは日付の解析を行わずに飛ばす
+            if not item_types:
+                continue
+
             days_open = _calc_age_days(st.created)
             status = st.status or "未設定"
             assignee = st.assignee or "(未割り当て)"
             due_raw = st.due_date
             due_label, due_in_days, due_status = _calc_due_info(due_raw)
+            base_score = (
+                _EVIDENCE_PRIORITY_WEIGHTS.get(priority_norm, 0.2) * 5
+                + (float(days_open) if days_open is not None else 0.0)
+            )
 
-            def _append(item_type: str) -> None:
+            for item_type in item_types:
+                sig = (item_type, st.key)
+                if sig in evidence:
+                    continue
                 category = _category_for_type(item_type)
-                reason_text = _build_reason(category, st.priority, assignee, days_open, due_label)
-                evidence.append({
+                reason_text = _build_reason(category, priority, assignee, days_open, due_label)
+                type_weight = 2 if item_type == "highPriorityNotDone" else 1
+                evidence[sig] = (type_weight * 10 + base_score, {
                     "type": item_type,
                     "category": category,
                     "key": st.key,
                     "summary": st.summary,
-                    "priority": st.priority,
+                    "priority": priority,
                     "assignee": assignee,
                     "status": status,
                     "days": days_open,
@@ -501,42 +746,17 @@ def _extract_evidence(core_data: CoreData, query_results: Dict[str, int], metada
                     "reason": reason_text,
                 })
 
-            if st.priority and st.priority.strip().lower() in {"highest", "high"}:
-                _append("highPriorityNotDone")
-            if not st.assignee:
-                _append("unassigned")
-
     if not evidence:
         return None
 
-    # 重複除去 (type, key)
-    unique: Dict[tuple[str, str], Dict[str, Any]] = {}
-    for item in evidence:
-        sig = (item["type"], item["key"])
-        if sig not in unique:
-            unique[sig] = item
-
-    ranked = list(unique.values())
-
-    def _score(item: Dict[str, Any]) -> float:
-        type_weight = 2 if item.get("type") == "highPriorityNotDone" else 1
-        priority = str(item.get("priority") or "").lower()
-        priority_weight = {
-            "highest": 1.0,
-            "high": 0.8,
-            "medium": 0.4,
-        }.get(priority, 0.2)
-        days = item.get("days")
-        days_weight = float(days) if isinstance(days, (int, float)) else 0.0
-        return type_weight * 10 + priority_weight * 5 + days_weight
-
-    ranked.sort(key=_score, reverse=True)
+    ranked = sorted(evidence.values(), key=_get_score, reverse=True)
 
     limit = max(1, int(os.getenv("EVIDENCE_TOP_N", str(top_n))))
-    return ranked[:limit]
+    return [item for _, item in ranked[:limit]]
 
 
 def _calculate_historical_velocity(
+    request_jira: RequestJiraRepository,
     board_id: int,
     story_points_field: str,
     sample_limit: int = 6,
@@ -558,7 +778,6 @@ def _calculate_historical_velocity(
         if enable_logging:
             print("[Phase 4] Historical Velocity(ALL issues) 取得開始 board_id=%s sample_limit=%s", board_id, sample_limit)
 
-        request_jira = RequestJiraRepository()
         data = request_jira.get_sprint(board_id=board_id, state="closed", maxResults=200)
         # print(data)
         if not data:
@@ -577,41 +796,48 @@ def _calculate_historical_velocity(
             if enable_logging:
                 print("[Phase 4] sprint sort error: %s", se)
         samples: List[Dict[str, Any]] = []
-        for idx, sp in enumerate(values):
-            if len(samples) >= sample_limit:
-                break
+        candidates = [sp for sp in values if sp.id is not None]
+        fetch_fields = [story_points_field, "status"]
+
+        try:
+            page_size = max(1, int(os.getenv("JIRA_PAGE_SIZE", "1000")))
+        except ValueError:
+            page_size = 1000
+
+        def _fetch_sprint_issues(sprint_id: Any) -> List[Dict[str, Any]]:
+            # SPとステータスだけを生dictで取得する（Issueオブジェクトを組み立てず、大きなページで往復回数を抑える）
+            try:
+                return list(request_jira.iter_jql(f"Sprint={sprint_id}", fields=fetch_fields, batch=page_size))
+            except Exception as fe:
+                print(f"[Phase 4] Sprint id={sprint_id} 課題取得失敗: {fe}")
+                return []
+
+        def _build_sample(sp: Any, issues: Any) -> Optional[Dict[str, Any]]:
             sid = sp.id
-            if sid is None:
-                continue
             sname = sp.name
             comp = sp.completeDate or sp.endDate
             if enable_logging:
                 print("[Phase 4] Sprint集計開始 id=%s name=%s complete=%s", sid, sname, comp)
-            # fetch_code, issues, fetch_err = _fetch_sprint_issues(client, sid, story_points_field, batch=100)
-            issues = request_jira.request_jql(query=f"Sprint={sid}", fields=story_points_field)
-            # if fetch_code != 200:
-                # if enable_logging:
-                #     print("[Phase 4] Sprint id=%s Agile API取得失敗 code=%s err=%s -> search fallback", sid, fetch_code, fetch_err)
-                # fallback_jql = f"Sprint={sid}"
-                # fetch_code, issues, fetch_err = client.search_paginated(fallback_jql, ["status", story_points_field], batch=200)
-            # if fetch_code != 200:
-            #     if enable_logging:
-            #         print("[Phase 4] Sprint id=%s 課題取得失敗 code=%s err=%s", sid, fetch_code, fetch_err)
-            #     continue
+            issues = issues or []
             planned = 0.0
             completed = 0.0
-            for issue_data in issues:
-                issue = issue_data.raw
-                flds = (issue or {}).get("fields", {})
-                sp_raw = flds.get(story_points_field)
-                sp_val = _normalize_story_points(sp_raw)
+            # 課題数ぶん回るため、参照するフィールド名・関数はローカルに束縛しておく
+            spf = story_points_field
+            normalize = _normalize_story_points
+            is_done = _is_done
+            for issue in issues:
+                try:
+                    flds = issue["fields"]
+                except (KeyError, TypeError):
+                    continue
+                sp_val = normalize(flds.get(spf))
                 planned += sp_val
-                if _is_done(flds.get("status")):
+                if is_done(flds.get("status")):
                     completed += sp_val
             if planned == 0 and completed == 0:
                 if enable_logging:
                     print("[Phase 4] Sprint id=%s 課題0件 -> サンプル除外 (issues=%d)", sid, len(issues))
-                continue
+                return None
             rate = (completed / planned) if planned > 0 else 0.0
             sample = {
                 "sprintId": sid,
@@ -620,9 +846,22 @@ def _calculate_historical_velocity(
                 "completedSP": round(completed, 2),
                 "rate": rate,
             }
-            samples.append(sample)
             if enable_logging:
                 print("[Phase 4] Sprint集計完了 id=%s planned=%.2f completed=%.2f rate=%.1f%%", sid, sample["plannedSP"], sample["completedSP"], rate*100)
+            return sample
+
+        # 不足しているサンプル数ぶんのスプリントをまとめて並列に取得し、新しい順に集計する
+        # （SP=0で除外されたスプリントがあれば、次のスプリント群を追加で取得する）
+        with ThreadPoolExecutor(max_workers=max(1, min(sample_limit, len(candidates)))) as executor:
+            pos = 0
+            while len(samples) < sample_limit and pos < len(candidates):
+                window = candidates[pos:pos + sample_limit - len(samples)]
+                pos += len(window)
+                fetched = executor.map(_fetch_sprint_issues, [sp.id for sp in window])
+                for sp, issues in zip(window, fetched):
+                    sample = _build_sample(sp, issues)
+                    if sample is not None:
+                        samples.append(sample)
         if not samples:
             if enable_logging:
                 print("[Phase 4] Historical Velocity: 有効サンプル0件 (全closed sprint SP=0?)")
@@ -681,8 +920,12 @@ def _to_utc(dt: Optional[datetime]) -> Optional[datetime]:
     return dt.astimezone(timezone.utc)
 
 
+@lru_cache(maxsize=256)
 def _is_done_status_name(name: Optional[str]) -> bool:
-    """ステータス名が完了カテゴリに該当するか判定する。"""
+    """ステータス名が完了カテゴリに該当するか判定する。
+
+    changelog の各イベントごとに呼ばれるが、ステータス名の種類は少ないため結果をキャッシュする。
+    """
     if not name:
         return False
     normalized = _normalize_status_key(name)
@@ -691,6 +934,7 @@ def _is_done_status_name(name: Optional[str]) -> bool:
 
 def _calculate_time_in_status(
     metadata: JiraMetadata,
+    request_jira: RequestJiraRepository,
     unit: str = "days",
     scope: str = "sprint",
     enable_logging: bool = True,
@@ -747,8 +991,12 @@ def _calculate_time_in_status(
         if calc_until < calc_since:
             calc_until = calc_since
 
-        request_jira = RequestJiraRepository()
-        issues = request_jira.request_jql(query=jql,fields=["status"])
+        # 課題一覧は id/key だけ使うため、jira.Issue に変換せず生dictのまま受け取る
+        try:
+            raw_issues = list(request_jira.iter_jql(jql, fields=["status"]))
+        except Exception as list_error:
+            print(f"[Phase 4] Time-in-status: 課題一覧の取得に失敗: {list_error}")
+            raw_issues = []
 
 
         # if code != 200:
@@ -767,15 +1015,31 @@ def _calculate_time_in_status(
         total_by_status: Dict[str, float] = {}
         per_issue_results: List[Dict[str, Any]] = []
 
-        for issue in issues:
-            issue = issue.raw
-            issue_id = issue.get("id") or issue.get("key")
+        # 課題ごとの changelog 取得はネットワーク待ちが支配的なため並列化する
+        try:
+            tis_workers = max(1, int(os.getenv("TIS_CONCURRENCY", "8")))
+        except ValueError:
+            tis_workers = 8
+
+        def _fetch_detail(issue_id: Optional[str]) -> Any:
+            if not issue_id:
+                return None
+            try:
+                return request_jira.get_issue(issue_id, expand="changelog")
+            except Exception as fetch_error:
+                if enable_logging:
+                    print(f"[Phase 4] Time-in-status: 課題詳細取得失敗 id={issue_id} err={fetch_error}")
+                return None
+
+        issue_ids = [issue.get("id") or issue.get("key") for issue in raw_issues]
+        with ThreadPoolExecutor(max_workers=tis_workers) as executor:
+            details = list(executor.map(_fetch_detail, issue_ids))
+
+        for issue, issue_id, detail_data in zip(raw_issues, issue_ids, details):
             issue_key = issue.get("key") or str(issue_id)
             if not issue_id:
                 per_issue_results.append({"key": issue_key, "byStatus": {}})
                 continue
-            
-            detail_data = request_jira.get_issue(issue_id, expand="changelog")
 
             if not detail_data:
                 # if enable_logging:
@@ -799,12 +1063,12 @@ def _calculate_time_in_status(
                 if not changed_at:
                     continue
                 for item in history.get("items") or []:
-                    field_name = str(item.get("field") or "").lower()
-                    if field_name != "status":
+                    # JSON由来の値は既に str のため、str() による再生成は行わない
+                    if (item.get("field") or "").lower() != "status":
                         continue
                     to_status = item.get("toString") or item.get("to")
                     if to_status:
-                        events.append((changed_at, str(to_status)))
+                        events.append((changed_at, to_status))
 
             events.sort(key=lambda row: row[0])
 
@@ -907,35 +1171,3 @@ def _calculate_time_in_status(
     #         print("[Phase 4] Time-in-status計算中にエラー: %s", exc)
     #     return None
 
-
-def _calculate_assignee_workload(core_data: CoreData) -> Dict[str, Dict[str, Any]]:
-    """
-    担当者別のワークロードを計算する。
-    
-    Args:
-        core_data: コアデータ
-    
-    Returns:
-        Dict[str, Dict[str, Any]]: 担当者名 -> ワークロード情報
-    """
-    workload: Dict[str, Dict[str, Any]] = {}
-    
-    for parent in core_data.parents:
-        for subtask in parent.subtasks:
-            assignee = subtask.assignee or "(未割り当て)"
-            
-            if assignee not in workload:
-                workload[assignee] = {
-                    "assignee": assignee,
-                    "subtasks": 0,
-                    "done": 0,
-                    "storyPoints": 0.0,
-                }
-            
-            workload[assignee]["subtasks"] += 1
-            workload[assignee]["storyPoints"] += _normalize_story_points(subtask.story_points)
-            
-            if subtask.done:
-                workload[assignee]["done"] += 1
-    
-    return workload
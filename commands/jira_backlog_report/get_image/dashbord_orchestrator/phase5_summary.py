@@ -3,14 +3,22 @@ Phase 5: AI要約生成
 Gemini APIを使用してスプリントの要約とエビデンスの理由を生成する。
 """
 
+import hashlib
 import logging
 import os
-import json
-from typing import Dict, Any, Optional, List, TYPE_CHECKING, Iterable
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Callable, Optional, List, Tuple, TYPE_CHECKING, Iterable
 from textwrap import dedent
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from dataclasses import dataclass
 from datetime import datetime, date
 
-from google import genai
+import orjson
 
 
 from commands.jira_backlog_report.get_image.dashbord_orchestrator.types import (
@@ -18,23 +26,133 @@ from commands.jira_backlog_report.get_image.dashbord_orchestrator.types import (
     CoreData,
     MetricsCollection,
     AISummary,
+    ParentTask,
 )
-from dotenv import load_dotenv
+from util import json_cache, telemetry
+from util.dotenv_loader import ensure_env_loaded
 
-load_dotenv()
+if TYPE_CHECKING:
+    from google import genai
 
-logger = logging.getLogger(__name__)
-
-# Gemini設定
-GEMINI_TIMEOUT = os.getenv("GEMINI_TIMEOUT", "12")
-GEMINI_RETRIES = os.getenv("GEMINI_RETRIES", "1")
-GEMINI_DEBUG = os.getenv("GEMINI_DEBUG", "").lower() in ("1", "true", "yes")
+ensure_env_loaded()
 
+logger = logging.getLogger(__name__)
 
 class SummaryError(Exception):
     """AI要約生成時のエラー"""
     pass
 
+
+@dataclass(frozen=True, slots=True)
+class GeminiConfig:
+    """Gemini呼び出しの設定（環境変数からモジュール読み込み時に一度だけ解析する）"""
+    model: str = "gemini-2.5-flash"
+    # 0 以下ならタイムアウトを設定しない（思考・ストリーミング応答は長くかかるため、既定では指定しない）
+    timeout: float = 0.0
+    retries: int = 1
+    temperature: float = 0.2
+    top_p: float = 0.9
+    rpm: int = 15
+    tpm: int = 250000
+    evidence_reasons: bool = True
+    reason_max_chars: int = 38
+    reason_batch_size: int = 8
+    # 呼び出しごとのキャッシュ利用・試行回数・所要時間を util.telemetry に記録する
+    telemetry: bool = False
+    disable: bool = False
+    debug: bool = False
+    # 応答をストリーミングで受け取る（0 で一括受信に戻す）
+    stream: bool = True
+    # デバッグ用: 親タスクを省略せず to_dict() のままコンテキストに含める
+    full_context: bool = False
+    # 同一プロンプトの要約を再利用する（スプリントの再描画で同じ内容を問い合わせないため）
+    cache: bool = False
+    cache_ttl: int = 3600
+    # この件数以下のスプリントはAIを使わず定型の要約にする（0 でサブタスクのないスプリントのみ）
+    trivial_max_subtasks: int = 3
+
+
+def _env_number(name: str, default: Any, cast: Callable[[str], Any]) -> Any:
+    try:
+        return cast(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    if default:
+        return value.lower() not in ("0", "false", "no")
+    return value.lower() in ("1", "true", "yes")
+
+
+def _load_config() -> GeminiConfig:
+    """環境変数から GeminiConfig を作る（不正な値は既定値にする）。"""
+    defaults = GeminiConfig()
+    return GeminiConfig(
+        model=os.getenv("GEMINI_MODEL", defaults.model),
+        timeout=_env_number("GEMINI_TIMEOUT", defaults.timeout, float),
+        retries=max(0, _env_number("GEMINI_RETRIES", defaults.retries, int)),
+        temperature=_env_number("GEMINI_TEMPERATURE", defaults.temperature, float),
+        top_p=_env_number("GEMINI_TOP_P", defaults.top_p, float),
+        rpm=_env_number("GEMINI_RPM", defaults.rpm, int),
+        tpm=_env_number("GEMINI_TPM", defaults.tpm, int),
+        evidence_reasons=os.getenv("GEMINI_EVIDENCE_REASON", "1").lower() not in ("0", "false", "no"),
+        reason_max_chars=_env_number("EVIDENCE_REASON_MAX_CHARS", defaults.reason_max_chars, int),
+        reason_batch_size=max(1, _env_number("EVIDENCE_BATCH_SIZE", defaults.reason_batch_size, int)),
+        telemetry=_env_flag("GEMINI_TELEMETRY", defaults.telemetry),
+        disable=_env_flag("GEMINI_DISABLE", defaults.disable),
+        debug=_env_flag("GEMINI_DEBUG", defaults.debug),
+        stream=_env_flag("GEMINI_STREAM", defaults.stream),
+        full_context=_env_flag("GEMINI_FULL_CONTEXT", defaults.full_context),
+        cache=_env_flag("GEMINI_CACHE", defaults.cache),
+        cache_ttl=_env_number("GEMINI_CACHE_TTL", defaults.cache_ttl, int),
+        trivial_max_subtasks=_env_number("GEMINI_TRIVIAL_MAX_SUBTASKS", defaults.trivial_max_subtasks, int),
+    )
+
+
+_CONFIG: GeminiConfig = _load_config()
+
+
+def _reload_config() -> GeminiConfig:
+    """環境変数を読み直して設定を更新する（テストや設定変更時用）。"""
+    global _CONFIG
+    _CONFIG = _load_config()
+    _get_rate_limiter.cache_clear()
+    _get_client.cache_clear()
+    _get_key_pool.cache_clear()
+    return _CONFIG
+
+
+@lru_cache(maxsize=1)
+def _try_import_genai() -> Optional[Any]:
+    """
+    google-genai を一度だけ読み込む。未導入ならNone（警告も一度だけ出す）。
+    
+    GEMINI_DISABLE 時は呼ばれないため、無効化した環境では読み込み自体を行わない。
+    """
+    try:
+        from google import genai
+        import google.genai.errors  # noqa: F401  (genai.errors.APIError を参照するため)
+    except ImportError as e:
+        logger.warning("google-genai を読み込めません。AI要約は定型文になります: %s", e)
+        return None
+    return genai
+
+
+@lru_cache(maxsize=16)
+def _get_client(api_key: Optional[str]) -> "genai.Client":
+    """
+    APIキーごとのGeminiクライアントをプロセス内で共有する。
+    
+    要約・エビデンス理由・再試行のすべてが同じクライアントのHTTP接続プールを使い回し、
+    呼び出しごとの接続確立を省く。タイムアウト（GEMINI_TIMEOUT 秒）もここで設定する。
+    """
+    timeout_ms = int(_CONFIG.timeout * 1000) if _CONFIG.timeout > 0 else None
+    return _try_import_genai().Client(api_key=api_key, http_options={"timeout": timeout_ms})
+
 def _summarize_velocity(data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     summary: Dict[str, Any] = {}
     if not isinstance(data, dict):
@@ -81,6 +199,18 @@ def _summarize_workload(workload: Optional[Dict[str, Dict[str, Any]]], limit: in
     return rows[:limit]
 
 
+# (出力キー, 入力キー) の対応（期限は duedate/due のどちらかを使うため別に扱う）
+_EVIDENCE_FIELDS = (
+    ("key", "key"),
+    ("summary", "summary"),
+    ("status", "status"),
+    ("assignee", "assignee"),
+    ("priority", "priority"),
+    ("days", "days"),
+    ("reason", "why"),
+)
+
+
 def _summarize_evidence(evidence: Optional[Iterable[Dict[str, Any]]], limit: int = 5) -> List[Dict[str, Any]]:
     result: List[Dict[str, Any]] = []
     if not evidence:
@@ -88,16 +218,8 @@ def _summarize_evidence(evidence: Optional[Iterable[Dict[str, Any]]], limit: int
     for row in evidence:
         if not isinstance(row, dict):
             continue
-        trimmed = {
-            "key": row.get("key"),
-            "summary": row.get("summary"),
-            "status": row.get("status"),
-            "assignee": row.get("assignee"),
-            "priority": row.get("priority"),
-            "days": row.get("days"),
-            "reason": row.get("why"),
-            "due": row.get("duedate") or row.get("due"),
-        }
+        trimmed = {out_key: row.get(in_key) for out_key, in_key in _EVIDENCE_FIELDS}
+        trimmed["due"] = row.get("duedate") or row.get("due")
         result.append(trimmed)
         if len(result) >= limit:
             break
@@ -110,47 +232,94 @@ def _summarize_status_counts(status_counts: Optional[Dict[str, Any]], limit: int
 
     summary: Dict[str, Any] = {"total": status_counts.get("total")}
     rows = status_counts.get("byStatus") if isinstance(status_counts.get("byStatus"), list) else []
-    compact: List[Dict[str, Any]] = []
-    for row in rows[:limit]:
-        if not isinstance(row, dict):
-            continue
-        compact.append({"name": row.get("name"), "count": row.get("count")})
+    compact = [
+        {"name": row.get("status") or row.get("name"), "count": row.get("count")}
+        for row in rows[:limit]
+        if isinstance(row, dict)
+    ]
     if compact:
         summary["by_status"] = compact
     return summary
 
 
+# (出力キー, metrics.risks のキー)
+_RISK_FIELDS = (
+    ("overdue", "overdue"),
+    ("due_soon", "dueSoon"),
+    ("high_priority_unstarted", "highPriorityTodo"),
+)
+
+# AI要約に渡すKPI
+_KPI_KEYS = (
+    "projectTotal",
+    "projectOpenTotal",
+    "sprintTotal",
+    "sprintDone",
+    "sprintOpen",
+    "unassignedCount",
+)
+
+
+def _safe_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
 def _normalize_risks(risks: Optional[Dict[str, Any]]) -> Dict[str, int]:
-    result: Dict[str, int] = {"overdue": 0, "due_soon": 0, "high_priority_unstarted": 0}
     if not isinstance(risks, dict):
-        return result
-    try:
-        result["overdue"] = int(risks.get("overdue", 0))
-    except Exception:
-        pass
-    try:
-        result["due_soon"] = int(risks.get("dueSoon", 0))
-    except Exception:
-        pass
-    try:
-        result["high_priority_unstarted"] = int(risks.get("highPriorityTodo", 0))
-    except Exception:
-        pass
-    return result
+        return {out_key: 0 for out_key, _ in _RISK_FIELDS}
+    return {out_key: _safe_int(risks.get(in_key, 0)) for out_key, in_key in _RISK_FIELDS}
 
 
 def _select_kpis(kpis: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     if not isinstance(kpis, dict):
         return {}
-    keys = [
-        "projectTotal",
-        "projectOpenTotal",
-        "sprintTotal",
-        "sprintDone",
-        "sprintOpen",
-        "unassignedCount",
+    return {k: kpis[k] for k in _KPI_KEYS if k in kpis}
+
+
+@lru_cache(maxsize=128)
+def _parse_iso_date(value: str) -> Optional[date]:
+    """ISO 8601 文字列（末尾 Z 可）から日付を取り出す。解析できなければNone。"""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+    except ValueError:
+        return None
+
+
+def _coerce_end_date(value: Any) -> Optional[date]:
+    """スプリント終了日（ISO文字列・date・datetime）を date にする。解釈できなければNone。"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        return _parse_iso_date(value)
+    return None
+
+
+def _summarize_parent(parent: ParentTask) -> Dict[str, Any]:
+    """親タスクを件数と未完了サブタスクだけに絞る（完了済みサブタスクの詳細はプロンプトで使わない）。"""
+    open_subtasks = [
+        {
+            "key": st.key,
+            "summary": st.summary,
+            "status": st.status,
+            "assignee": st.assignee,
+        }
+        for st in parent.subtasks
+        if not st.done
     ]
-    return {k: kpis.get(k) for k in keys if k in kpis}
+    return {
+        "key": parent.key,
+        "summary": (parent.summary or "")[:80],
+        "assignee": parent.assignee,
+        "assignees": sorted({st.assignee for st in parent.subtasks if st.assignee}),
+        "subtasks_total": len(parent.subtasks),
+        "subtasks_done": len(parent.subtasks) - len(open_subtasks),
+        "open_subtasks": open_subtasks,
+    }
 
 
 def _build_context(
@@ -164,28 +333,13 @@ def _build_context(
     sprint_start = metadata.sprint["startDate"]
     sprint_end = metadata.sprint["endDate"]
 
-    remaining_days = 0
-    if sprint_end:
-        try:
-            if isinstance(sprint_end, str):
-                end_date = datetime.fromisoformat(sprint_end.replace("Z", "+00:00")).date()
-            else:
-                end_date = sprint_end
-            remaining_days = max(0, (end_date - date.today()).days)
-        except Exception:
-            remaining_days = 0
+    end_date = _coerce_end_date(sprint_end)
+    remaining_days = max(0, (end_date - date.today()).days) if end_date is not None else 0
 
     done_percent = core_data.totals.completion_rate * 100
     target_percent = int(0.8 * 100)
 
-    assignees = sorted(
-        {
-            subtask.assignee
-            for parent in core_data.parents
-            for subtask in parent.subtasks
-            if subtask.assignee
-        }
-    )[:25]
+    assignees = core_data.assignees[:25]
 
     subtasks_total = core_data.totals.subtasks
     subtasks_done = core_data.totals.done
@@ -218,163 +372,591 @@ def _build_context(
         "workload": _summarize_workload(metrics.assignee_workload),
         "top_evidence": _summarize_evidence(metrics.evidence),
         "status_snapshot": _summarize_status_counts(metrics.status_counts),
-        "parents": [parent.to_dict() for parent in core_data.parents],
+        "parents": [
+            parent.to_dict() if _CONFIG.full_context else _summarize_parent(parent)
+            for parent in core_data.parents
+        ],
     }
 
     return context
 
 
+# 要約プロンプトの固定部分（Gemini の暗黙的なプロンプトキャッシュは先頭一致で効くため、
+# 実行ごとに変わる担当者リストとコンテキストはこの後ろに付ける）
+_SUMMARY_INTRO = dedent(
+    """
+    あなたは経験豊富なアジャイルコーチ兼データアナリストです。提示するコンテキスト(JSON)のみを唯一の事実情報源として分析し、
+    仮定や想像の数値は用いず、[出力形式]に厳密に従って、実務に直結する洞察とアクションを提示してください。
+    """
+)
+
+_SUMMARY_OUTPUT_FORMAT = dedent(
+    """
+    ## 🎯 結論（1行断言）
+    完了率[X%] - [順調✅/注意⚠️/危険🚨] 残[Y]日で目標[Z%]（[理由5字以内]）
+
+    ## 🚨 即実行アクション（重要順3つ）
+    ※担当者名は必ず【担当者リスト】から選択してください
+    1. [担当者] → [タスク] （[期限]）
+    2. [担当者] → [タスク] （[期限]）
+    3. [担当者] → [タスク] （[期限]）
+
+    ## 📊 根拠（2行以内）
+    • データ: 完了[X]/全[Y]件、必要消化[Z]件/日（実績[W]件/日）
+    • 問題: [最大リスク] + [ボトルネック] = [影響度数値]
+    """
+)
+
+_SUMMARY_CONSTRAINTS = dedent(
+    """
+    【厳守制約】
+    - 曖昧語禁止（推測・可能性・おそらく等）
+    - 専門語→平易語（実装→作成、レビュー→確認、アサイン→割当）
+    - 全数値必須、担当者名・期限必須
+    - 各セクション規定行数厳守（結論1行、アクション3行、根拠2行）
+    - 文字数300字以内、Markdown形式
+    - JSONデータ以外の情報使用禁止
+    """
+)
+
+_SUMMARY_FORMAT_SPECS = dedent(
+    """
+    【出力仕様】
+    • ステータス判定: 完了率80%以上→✅順調、60-79%→⚠️注意、60%未満→🚨危険
+    • アクション優先順位: 1)期限超過 2)期限間近 3)高優先度未着手 4)確認待ち 5)未割当
+    • 数値必須項目: 完了率%、残日数、完了件数/全件数、必要消化件数/日、実績件数/日
+    • 担当者表記: フルネーム不要、姓のみ可（田中、佐藤等）
+    • 期限表記: 相対表現（今日、明日、X日後）または具体日時
+    """
+)
+
+_SUMMARY_EXAMPLE_OUTPUT = dedent(
+    """
+    【出力例】
+    ## 🎯 結論（1行断言）
+    完了率65% - 注意⚠️ 残3日で目標80%（遅延有）
+
+    ## 🚨 即実行アクション（重要順3つ）
+    1. 田中 → API作成完了 （明日17時）
+    2. 佐藤 → UI確認完了 （明日12時）
+    3. 山田 → DB設計割当 （今日中）
+
+    ## 📊 根拠（2行以内）
+    • データ: 完了13/20件、必要消化3件/日（実績2.1件/日）
+    • 問題: API遅延2日 + 確認待ち5件 = 目標未達リスク40%
+    """
+)
+
+STATIC_PROMPT_PREFIX = (
+    _SUMMARY_INTRO
+    + "\n[出力形式]\n" + _SUMMARY_OUTPUT_FORMAT
+    + "\n" + _SUMMARY_CONSTRAINTS
+    + "\n" + _SUMMARY_FORMAT_SPECS
+    + "\n" + _SUMMARY_EXAMPLE_OUTPUT
+)
+
+
+def _dumps(value: Any) -> str:
+    """プロンプトに埋め込むためのコンパクトなJSON文字列（日本語はエスケープしない）。"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS, default=str).decode("utf-8")
+
+
+def _is_trivial_sprint(context: Dict[str, Any]) -> bool:
+    """
+    AIに問い合わせるまでもないスプリントか（サブタスクが GEMINI_TRIVIAL_MAX_SUBTASKS 件以下、または完了率100%）。
+    
+    残日数0はスプリント最終日も含み、その日のアクション提示が最も重要なため対象にしない。
+    """
+    return (
+        context.get("subtasks_total", 0) <= _CONFIG.trivial_max_subtasks
+        or context.get("done_percent", 0) >= 100
+    )
+
+
 def _generate_prompt(
     context: Dict[str, Any]
 ) -> Optional[str]:
     """
-    Gemini APIを使用して要約を生成する。
+    要約生成用のプロンプトを構築する。
     
     Args:
-        genai: google.generativeai モジュール
-        api_key: サニタイズ済みAPIキー
         context: コンテキスト辞書
     
     Returns:
-        Optional[str]: 生成された要約。失敗時はNone
+        Optional[str]: 構築したプロンプト。失敗時はNone
     """
     try:
-        # プロンプト構築
         assignee_str = ", ".join(context["assignees"]) if context["assignees"] else "(担当者なし)"
-
-        intro = dedent(
-            """
-            あなたは経験豊富なアジャイルコーチ兼データアナリストです。提示するコンテキスト(JSON)のみを唯一の事実情報源として分析し、
-            仮定や想像の数値は用いず、[出力形式]に厳密に従って、実務に直結する洞察とアクションを提示してください。
-            """
+        return (
+            STATIC_PROMPT_PREFIX
+            + f"\n\n【担当者リスト】\n{assignee_str}\n"
+            + f"\n【分析対象データ】\nコンテキスト(JSON): {_dumps(context)}\n"
+            + "\n上記JSONデータのみを根拠として、出力形式に厳密に従い分析結果を出力してください。"
         )
+    except Exception as e:
+        if _CONFIG.debug:
+            logger.error("プロンプト構築エラー: %s", e)
+        return None
 
-        output_format = dedent(
-            f"""
-            ## 🎯 結論（1行断言）
-            完了率[X%] - [順調✅/注意⚠️/危険🚨] 残[Y]日で目標[Z%]（[理由5字以内]）
-
-            ## 🚨 即実行アクション（重要順3つ）
-            ※担当者名は必ず以下のリストから選択してください: {assignee_str}
-            1. [担当者] → [タスク] （[期限]）
-            2. [担当者] → [タスク] （[期限]）
-            3. [担当者] → [タスク] （[期限]）
-
-            ## 📊 根拠（2行以内）
-            • データ: 完了[X]/全[Y]件、必要消化[Z]件/日（実績[W]件/日）
-            • 問題: [最大リスク] + [ボトルネック] = [影響度数値]
-            """
-        )
 
-        constraints = dedent(
-            """
-            【厳守制約】
-            - 曖昧語禁止（推測・可能性・おそらく等）
-            - 専門語→平易語（実装→作成、レビュー→確認、アサイン→割当）
-            - 全数値必須、担当者名・期限必須
-            - 各セクション規定行数厳守（結論1行、アクション3行、根拠2行）
-            - 文字数300字以内、Markdown形式
-            - JSONデータ以外の情報使用禁止
-            """
-        )
+class _GeminiRateLimiter:
+    """
+    直近60秒のリクエスト数・入力トークン数を上限以下に保つ。
+    
+    要約とエビデンス理由は並行して呼ばれるため、ロックで送信記録を共有する。
+    上限が0以下の項目は制限しない。
+    """
 
-        format_specs = dedent(
-            """
-            【出力仕様】
-            • ステータス判定: 完了率80%以上→✅順調、60-79%→⚠️注意、60%未満→🚨危険
-            • アクション優先順位: 1)期限超過 2)期限間近 3)高優先度未着手 4)確認待ち 5)未割当
-            • 数値必須項目: 完了率%、残日数、完了件数/全件数、必要消化件数/日、実績件数/日
-            • 担当者表記: フルネーム不要、姓のみ可（田中、佐藤等）
-            • 期限表記: 相対表現（今日、明日、X日後）または具体日時
-            """
-        )
+    def __init__(self, rpm: int, tpm: int):
+        self._rpm = rpm
+        self._tpm = tpm
+        self._lock = threading.Lock()
+        self._sent: deque = deque()  # (送信時刻, 推定入力トークン数)
+        self._sent_tokens = 0
+
+    def acquire(self, tokens: int) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0][0] >= 60:
+                    self._sent_tokens -= self._sent.popleft()[1]
+                within_rpm = self._rpm <= 0 or len(self._sent) < self._rpm
+                # 1回分で上限を超える大きなプロンプトは、窓が空になった時点で通す
+                within_tpm = self._tpm <= 0 or not self._sent or self._sent_tokens + tokens <= self._tpm
+                if within_rpm and within_tpm:
+                    self._sent.append((now, tokens))
+                    self._sent_tokens += tokens
+                    return
+                delay = 60 - (now - self._sent[0][0])
+            time.sleep(max(delay, 0.05))
+
+
+@lru_cache(maxsize=16)
+def _get_rate_limiter(api_key: Optional[str]) -> _GeminiRateLimiter:
+    """
+    APIキーごとの制限を GEMINI_RPM / GEMINI_TPM の設定から作る（既定は無料枠の上限）。
+    
+    上限はキーの属するプロジェクト単位でかかるため、キーごとに別の記録を持つ。
+    """
+    return _GeminiRateLimiter(_CONFIG.rpm, _CONFIG.tpm)
 
-        example_output = dedent(
-            """
-            【出力例】
-            ## 🎯 結論（1行断言）
-            完了率65% - 注意⚠️ 残3日で目標80%（遅延有）
-
-            ## 🚨 即実行アクション（重要順3つ）
-            1. 田中 → API作成完了 （明日17時）
-            2. 佐藤 → UI確認完了 （明日12時）
-            3. 山田 → DB設計割当 （今日中）
-
-            ## 📊 根拠（2行以内）
-            • データ: 完了13/20件、必要消化3件/日（実績2.1件/日）
-            • 問題: API遅延2日 + 確認待ち5件 = 目標未達リスク40%
-            """
-        )
-        
 
-        # コンテキスト縮小（主要指標のみ）
-        # compact_context = {
-        #     "sprint_name": context.get("sprint_name"),
-        #     "remaining_days": context.get("remaining_days"),
-        #     "done_percent": context.get("done_percent"),
-        #     "target_done_rate": context.get("target_done_rate"),
-        #     "subtasks_total": context.get("subtasks_total"),
-        #     "subtasks_done": context.get("subtasks_done"),
-        #     "subtasks_not_done": context.get("subtasks_not_done"),
-        #     "risks": context.get("risks"),
-        #     "top_evidence": context.get("top_evidence"),
-        #     "workload": context.get("workload"),
-        # }
-
-        def _build_prompt(ctx: Dict[str, Any]) -> str:
-            return (
-                intro
-                + "\n[出力形式]\n" + output_format
-                + "\n" + constraints
-                + "\n" + format_specs
-                + "\n" + example_output
-                + f"\n\n【分析対象データ】\nコンテキスト(JSON): {json.dumps(ctx, ensure_ascii=False, separators=(',', ':'))}\n"
-                + "\n上記JSONデータのみを根拠として、出力形式に厳密に従い分析結果を出力してください。"
-            )
+# 429 応答の RetryInfo に含まれる待機秒数（例: "retryDelay": "12s"）
+_RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*:\s*['\"](\d+(?:\.\d+)?)s")
+_MAX_BACKOFF_SEC = 32.0
 
 
-        prompt_to_use = _build_prompt(context)
+def _retry_delay(error: Optional[Exception], attempt: int) -> float:
+    """再試行までの待機秒数。サーバー指定があればそれを使い、なければ指数バックオフ＋ジッター。"""
+    if error is not None:
+        m = _RETRY_DELAY_RE.search(str(getattr(error, "details", None) or error))
+        if m:
+            return min(float(m.group(1)), _MAX_BACKOFF_SEC)
+    return min(_MAX_BACKOFF_SEC, 2.0 ** attempt) * (1 + random.uniform(-0.25, 0.25))
 
-        return prompt_to_use
 
+# 失敗の分類（_classify_error）。分類できない失敗は再試行せずに送出する
+_ERROR_AUTH = "auth"            # キーが無効・権限なし: 同じキーでは何度やっても失敗する
+_ERROR_QUOTA = "quota"          # 429: キーを休ませて別のキーへ
+_ERROR_TRANSIENT = "transient"  # 5xx・タイムアウト・通信断: 待って再試行
 
-    except Exception as e:
-        if GEMINI_DEBUG:
-            logger.error(f"プロンプト構築エラー: {e}")
+# 認証エラーになったキーを使わない時間（秒）
+_KEY_DISABLED_SEC = 3600.0
+
+
+@lru_cache(maxsize=1)
+def _transport_errors() -> Tuple[type, ...]:
+    """通信レベルの一時的な失敗として扱う例外（google-genai は httpx を使う）。"""
+    errors: List[type] = [TimeoutError, ConnectionError]
+    try:
+        import httpx
+        errors.append(httpx.TransportError)
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+def _classify_error(error: Exception) -> Optional[str]:
+    """Gemini呼び出しの失敗を再試行方針ごとに分類する。"""
+    if isinstance(error, _try_import_genai().errors.APIError):
+        code = getattr(error, "code", None)
+        if code in (401, 403) or "API_KEY_INVALID" in str(error):
+            return _ERROR_AUTH
+        if code == 429:
+            return _ERROR_QUOTA
+        if isinstance(code, int) and code >= 500:
+            return _ERROR_TRANSIENT
         return None
+    if isinstance(error, _transport_errors()):
+        return _ERROR_TRANSIENT
+    return None
+
+
+class _GeminiKeyPool:
+    """
+    複数のAPIキーを順番に使い分ける。
+    
+    429 を受けたキーは指定秒数だけ休ませ、その間は他のキーを返す。
+    """
+
+    def __init__(self, keys: List[Optional[str]]):
+        self._keys = keys
+        self._available_at: Dict[Optional[str], float] = {key: 0.0 for key in keys}
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def pick(self) -> Tuple[Optional[str], float]:
+        """使用するキーと、そのキーが使えるようになるまでの待機秒数を返す。"""
+        with self._lock:
+            now = time.monotonic()
+            count = len(self._keys)
+            for offset in range(count):
+                index = (self._next + offset) % count
+                key = self._keys[index]
+                if self._available_at[key] <= now:
+                    self._next = (index + 1) % count
+                    return key, 0.0
+            key = min(self._keys, key=self._available_at.__getitem__)
+            return key, self._available_at[key] - now
+
+    def cool_down(self, key: Optional[str], seconds: float) -> None:
+        with self._lock:
+            self._available_at[key] = max(self._available_at[key], time.monotonic() + seconds)
+
+
+@lru_cache(maxsize=1)
+def _get_key_pool() -> _GeminiKeyPool:
+    """
+    GEMINI_API_KEY_1..8 からキーの一覧を作る。
+    
+    いずれも未設定なら GEMINI_API_KEY を1つだけ使う。
+    """
+    keys: List[Optional[str]] = []
+    for i in range(1, 9):
+        key = (os.getenv(f"GEMINI_API_KEY_{i}") or "").strip()
+        if key and key not in keys:
+            keys.append(key)
+    if not keys:
+        keys.append((os.getenv("GEMINI_API_KEY") or "").strip() or None)
+    return _GeminiKeyPool(keys)
+
+
+def _response_text(response: Any) -> str:
+    """応答（ストリーミングの場合は各チャンク）の本文を取り出す。text が空なら candidates から組み立てる。"""
+    text = getattr(response, "text", None) or ""
+    if text:
+        return text
+    cand_texts = []
+    for c in getattr(response, "candidates", []) or []:
+        parts = getattr(getattr(c, "content", None), "parts", []) or []
+        frag = "".join(getattr(p, "text", None) or "" for p in parts)
+        if frag:
+            cand_texts.append(frag)
+    return "\n".join(cand_texts)
+
+
+def _generate_text(
+    key_pool: _GeminiKeyPool,
+    model_name: str,
+    contents: Optional[str],
+    is_complete: Optional[Callable[[str], bool]] = None,
+    config: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    レート制限を守りつつ Gemini API でテキストを生成する。
+    
+    config は generate_content にそのまま渡す生成設定。
+    GEMINI_STREAM が有効（既定）ならストリーミングで受け取り、is_complete が真を返した時点で受信を打ち切る。
+    
+    失敗は _classify_error の分類に応じて扱う。
+    - 認証エラー: そのキーを使わないようにして次のキーへ（すべてのキーが失敗したら送出）
+    - 429: キーを休ませて次のキーへ（キーが1つなら休み明けまで待つ）
+    - 5xx・タイムアウト・空応答: 待機して再試行
+    - それ以外: 再試行しても結果が変わらないため、そのまま送出
+    再試行の回数は GEMINI_RETRIES に、キーの数 - 1 回を加えたもの。
+    """
+    retries = _CONFIG.retries + len(key_pool) - 1
+    estimated_tokens = len(contents or "") // 4
+    started = time.perf_counter()
+    attempts = 0
+    text = ""
+    ok = False
+    auth_failed = set()
+
+    try:
+        for attempt in range(retries + 1):
+            attempts = attempt + 1
+            api_key, wait = key_pool.pick()
+            if wait > 0:
+                time.sleep(min(wait, _MAX_BACKOFF_SEC))
+            _get_rate_limiter(api_key).acquire(estimated_tokens)
+            try:
+                models = _get_client(api_key).models
+                if not _CONFIG.stream:
+                    text = _response_text(models.generate_content(model=model_name, contents=contents, config=config))
+                else:
+                    chunks: List[str] = []
+                    for chunk in models.generate_content_stream(model=model_name, contents=contents, config=config):
+                        chunks.append(_response_text(chunk))
+                        if is_complete is not None and is_complete("".join(chunks)):
+                            break
+                    text = "".join(chunks)
+            except Exception as e:
+                failure = _classify_error(e)
+                if failure is None or attempt >= retries:
+                    raise
+                if failure == _ERROR_AUTH:
+                    auth_failed.add(api_key)
+                    if len(auth_failed) >= len(key_pool):
+                        raise
+                    key_pool.cool_down(api_key, _KEY_DISABLED_SEC)
+                    logger.warning("Gemini API 認証エラー: 次のキーで再試行します (%s/%s)", attempt + 1, retries)
+                    continue
+                delay = _retry_delay(e, attempt)
+                if failure == _ERROR_QUOTA:
+                    # 次の pick で別のキーに切り替わる（なければ休み明けまで待つ）
+                    key_pool.cool_down(api_key, delay)
+                    logger.warning("Gemini API 429: キーを%.1f秒休ませて再試行します (%s/%s)", delay, attempt + 1, retries)
+                else:
+                    logger.warning("Gemini API %s: %.1f秒後に再試行します (%s/%s)", getattr(e, "code", None) or type(e).__name__, delay, attempt + 1, retries)
+                    time.sleep(delay)
+                continue
+
+            ok = True
+            if text or attempt >= retries:
+                return text
+            delay = _retry_delay(None, attempt)
+            logger.warning("Gemini API 空応答: %.1f秒後に再試行します (%s/%s)", delay, attempt + 1, retries)
+            time.sleep(delay)
+        return text
+    finally:
+        if _CONFIG.telemetry:
+            telemetry.log_event(
+                "gemini_call",
+                model=model_name,
+                prompt_hash=hashlib.sha256((contents or "").encode("utf-8")).hexdigest()[:16],
+                ok=ok,
+                attempts=attempts,
+                stream=_CONFIG.stream,
+                latency_ms=round((time.perf_counter() - started) * 1000, 1),
+                input_tokens_est=estimated_tokens,
+                output_chars=len(text),
+            )
+
+
+def _has_complete_json_object(text: str) -> bool:
+    """最初の '{' から始まるJSONオブジェクトが閉じているか（文字列リテラル内の括弧は数えない）。"""
+    start = text.find("{")
+    if start < 0:
+        return False
+    depth = 0
+    in_string = False
+    escaped = False
+    for ch in text[start:]:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return True
+    return False
+
+
+def _summary_cache_key(model_name: str, prompt: str) -> str:
+    """モデル名とプロンプトから要約キャッシュのキーを作る。"""
+    payload = orjson.dumps({"model": model_name, "prompt": prompt}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _generate_summary(
+    key_pool: _GeminiKeyPool,
+    model_name: str,
+    prompt: Optional[str]
+) -> Optional[str]:
+    """
+    Gemini APIで要約を生成する。
+    
+    GEMINI_CACHE が有効なら、同じモデル・プロンプトの応答を GEMINI_CACHE_TTL 秒の間再利用する。
+    
+    Args:
+        key_pool: 使用するAPIキー
+        model_name: 使用するモデル名
+        prompt: _generate_prompt で構築したプロンプト
+    
+    Returns:
+        Optional[str]: 生成された要約
+    """
+    cache_key = _summary_cache_key(model_name, prompt or "") if _CONFIG.cache else None
+    if cache_key is not None:
+        cached = json_cache.load("gemini_summary", cache_key, _CONFIG.cache_ttl)
+        if _CONFIG.telemetry:
+            telemetry.log_event("gemini_summary_cache", model=model_name, cached=bool(cached))
+        if cached:
+            if _CONFIG.debug:
+                logger.info("AI要約: キャッシュを使用しました")
+            return cached
+
+    full_text = _generate_text(key_pool, model_name, prompt) or None
+
+    if cache_key is not None and full_text:
+        json_cache.save("gemini_summary", cache_key, full_text)
+    return full_text
+
+
+# エビデンス理由プロンプトの固定部分（入力JSONは末尾に付ける）
+_EVIDENCE_PROMPT_TEMPLATE = dedent(
+    """
+    あなたはスクラムチームのアジャイルコーチです。以下の各小タスクについて、なぜ重要かを日本語で1文ずつ作成してください。
+    制約:
+    - 各行は最大{max_chars}文字以内で簡潔に。
+    - 根拠は滞留日数/期限/優先度/状態/担当など入力から導ける事実のみ。
+    - 断言的で実務的な表現（例: 期限差し迫り、優先度高、レビュー滞留 等）。
+    出力形式はJSONのみで、キーを課題キー、値を理由文字列としたオブジェクトで返してください。
+    出力: {{ "KEY": "理由" }} のマップのみを返してください。
+    """
+).strip()
+
+
+# 応答の前後に説明文が付いた場合に、JSONオブジェクト部分だけを取り出す
+_JSON_OBJ_RE = re.compile(r"\{[\s\S]*\}")
+
+
+def _evidence_cache_key(model_name: str, max_chars: int, item: Dict[str, Any]) -> str:
+    """エビデンス1件分の理由キャッシュのキーを作る（理由の根拠になる項目だけを使う）。"""
+    payload = orjson.dumps(
+        {"model": model_name, "max_chars": max_chars, "item": item},
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        default=str,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _request_evidence_reasons(
+    key_pool: _GeminiKeyPool,
+    model_name: str,
+    max_chars: int,
+    items: List[Dict[str, Any]]
+) -> Dict[str, str]:
+    """
+    エビデンスの理由をGemini APIに問い合わせ、応答のJSONを {課題キー: 理由} として返す。
+    
+    応答が空・解析できない場合は空の辞書を返す。
+    """
+    prompt = (
+        _EVIDENCE_PROMPT_TEMPLATE.format(max_chars=max_chars)
+        + f"\n\n入力: {_dumps(items)}"
+    )
+    # JSONモードで応答させ、説明文や```ブロックが混ざらないようにする
+    generation_config = {
+        "temperature": _CONFIG.temperature,
+        "top_p": _CONFIG.top_p,
+        "response_mime_type": "application/json",
+    }
+    
+    def _call(model_id: str) -> Optional[str]:
+        try:
+            # JSONオブジェクトが閉じた時点で以降の出力は使わないため、受信を打ち切る
+            text = _generate_text(
+                key_pool,
+                model_id,
+                prompt,
+                is_complete=_has_complete_json_object,
+                config=generation_config,
+            ).strip()
+            return text or None
+        except Exception:
+            return None
+    
+    text = _call(model_name)
+    
+    if not text:
+        if _CONFIG.debug:
+            logger.info("AI要約: evidence reasons 空応答（元の理由を使用）")
+        return {}
+    
+    # JSON抽出
+    result: Dict[str, str] = {}
+    try:
+        parsed = orjson.loads(text)
+        if isinstance(parsed, dict):
+            result = {str(k): str(v) for k, v in parsed.items()}
+    except Exception:
+        # JSONモードでは通常ここに来ない（来た場合は応答の一部から復旧を試みる）
+        logger.warning("AI要約: evidence reasons の応答がJSONとして解析できませんでした")
+        try:
+            m = _JSON_OBJ_RE.search(text)
+            if m:
+                parsed = orjson.loads(m.group(0))
+                if isinstance(parsed, dict):
+                    result = {str(k): str(v) for k, v in parsed.items()}
+        except Exception:
+            result = {}
+    
+    return result
+
+
+def _request_evidence_reasons_batched(
+    key_pool: _GeminiKeyPool,
+    model_name: str,
+    max_chars: int,
+    items: List[Dict[str, Any]]
+) -> Dict[str, str]:
+    """
+    エビデンスを EVIDENCE_BATCH_SIZE 件ずつに分けて並行に問い合わせ、結果をまとめる。
+    
+    1回の応答を短く保ち、長いJSONが途中で切れて一部の理由を失うのを防ぐ。
+    """
+    size = _CONFIG.reason_batch_size
+    batches = [items[i:i + size] for i in range(0, len(items), size)]
+    if len(batches) == 1:
+        return _request_evidence_reasons(key_pool, model_name, max_chars, batches[0])
+
+    result: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=min(4, len(batches))) as executor:
+        futures = [
+            executor.submit(_request_evidence_reasons, key_pool, model_name, max_chars, batch)
+            for batch in batches
+        ]
+        for future in futures:
+            result.update(future.result())
+    return result
 
 
 def _generate_evidence_reasons(
-    genai: genai.Client,
+    key_pool: _GeminiKeyPool,
     evidences: List[Dict[str, Any]]
 ) -> Dict[str, str]:
     """
     各エビデンスの重要な理由をGemini APIで生成する。
     
     Args:
-        genai: google.geni モジュール
-        api_key: サニタイズ済みAPIキー
+        key_pool: 使用するAPIキー
         evidences: エビデンスのリスト
     
     Returns:
         Dict[str, str]: {課題キー: 理由} のマップ
     """
-    if os.getenv("GEMINI_EVIDENCE_REASON", "1").lower() in ("0", "false", "no"):
+    if not _CONFIG.evidence_reasons:
         return {}
     
     if not evidences:
         return {}
     
     try:
-        model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
-        timeout_s = float(GEMINI_TIMEOUT)
-        temp = float(os.getenv("GEMINI_TEMPERATURE", "0.2"))
-        top_p = float(os.getenv("GEMINI_TOP_P", "0.9"))
-        
-        try:
-            max_chars = int(os.getenv("EVIDENCE_REASON_MAX_CHARS", "38"))
-        except Exception:
-            max_chars = 38
+        model_name = _CONFIG.model
+        max_chars = _CONFIG.reason_max_chars
         
         # 生成に必要な最小情報を構築
         items = []
@@ -388,76 +970,38 @@ def _generate_evidence_reasons(
                 "duedate": e.get("duedate") or e.get("due"),
                 "days": e.get("days"),
             })
-        
-        prompt = dedent(
-            f"""
-            あなたはスクラムチームのアジャイルコーチです。以下の各小タスクについて、なぜ重要かを日本語で1文ずつ作成してください。
-            制約:
-            - 各行は最大{max_chars}文字以内で簡潔に。
-            - 根拠は滞留日数/期限/優先度/状態/担当など入力から導ける事実のみ。
-            - 断言的で実務的な表現（例: 期限差し迫り、優先度高、レビュー滞留 等）。
-            出力形式はJSONのみで、キーを課題キー、値を理由文字列としたオブジェクトで返してください。
-
-            入力: {json.dumps(items, ensure_ascii=False)}
-            出力: {{ "KEY": "理由" }} のマップのみを返してください。
-            """
-        ).strip()
-        
 
-        # genai.configure(api_key=api_key, transport="rest")
-        # generation_config = {
-        #     "temperature": temp,
-        #     "top_p": top_p,
-        #     "max_output_tokens": 256
-        # }
-        
-        def _call(model_id: str) -> Optional[str]:
-            try:
-                # m = genai.GenerativeModel(model_id, generation_config=generation_config)
-                out = genai.models.generate_content(
-                    mdoel=model_id,
-                    contents=prompt)
-                # out = m.generate_content(prompt, request_options={"timeout": timeout_s})
-                text = (getattr(out, "text", None) or "").strip()
-                
-                if not text:
-                    # candidates fallback
-                    cand_texts = []
-                    for c in getattr(out, "candidates", []) or []:
-                        parts = getattr(getattr(c, "content", None), "parts", []) or []
-                        frag = "".join(getattr(p, "text", "") for p in parts)
-                        if frag:
-                            cand_texts.append(frag)
-                    text = "\n".join(t for t in cand_texts if t).strip()
-                
-                return text or None
-            except Exception:
-                return None
-        
-        text = _call(model_name)
-        
-        if not text:
-            if GEMINI_DEBUG:
-                logger.info("AI要約: evidence reasons 空応答（元の理由を使用）")
-            return {}
-        
-        # JSON抽出
+        # 前回と内容が変わっていないエビデンスはキャッシュ済みの理由を使い、残りだけを問い合わせる
         result: Dict[str, str] = {}
-        try:
-            parsed = json.loads(text)
-            if isinstance(parsed, dict):
-                result = {str(k): str(v) for k, v in parsed.items()}
-        except Exception:
-            try:
-                import re
-                m = re.search(r"\{[\s\S]*\}", text)
-                if m:
-                    parsed = json.loads(m.group(0))
-                    if isinstance(parsed, dict):
-                        result = {str(k): str(v) for k, v in parsed.items()}
-            except Exception:
-                result = {}
-        
+        pending = items
+        cache_keys: Dict[str, str] = {}
+        if _CONFIG.cache:
+            pending = []
+            for item in items:
+                cache_key = _evidence_cache_key(model_name, max_chars, item)
+                cached = json_cache.load("gemini_evidence_reason", cache_key, _CONFIG.cache_ttl)
+                if cached:
+                    result[str(item["key"])] = cached
+                else:
+                    cache_keys[str(item["key"])] = cache_key
+                    pending.append(item)
+            if _CONFIG.debug and result:
+                logger.info("AI要約: evidence reasons %s件をキャッシュから取得", len(result))
+            if _CONFIG.telemetry:
+                for item in items:
+                    telemetry.log_event(
+                        "gemini_evidence_reason_cache",
+                        model=model_name,
+                        cached=str(item["key"]) in result,
+                    )
+
+        if pending:
+            fresh = _request_evidence_reasons_batched(key_pool, model_name, max_chars, pending)
+            for key, reason in fresh.items():
+                if key in cache_keys:
+                    json_cache.save("gemini_evidence_reason", cache_keys[key], reason)
+            result.update(fresh)
+
         # 文字数制限を適用
         clipped: Dict[str, str] = {}
         for e in evidences:
@@ -471,8 +1015,8 @@ def _generate_evidence_reasons(
         return clipped
         
     except Exception as e:
-        if GEMINI_DEBUG:
-            logger.error(f"エビデンス理由生成エラー: {e}")
+        if _CONFIG.debug:
+            logger.error("エビデンス理由生成エラー: %s", e)
         return {}
 
 
@@ -501,35 +1045,44 @@ def generate_ai_summary(
     if enable_logging:
         logger.info("Phase 5: AI要約生成を開始します")
 
-    api_key = os.getenv("GEMINI_API_KEY")
-    
-
-    # try:
-    # 使用するモデルを指定（例: 'gemini-1.5-flash' など）
-    gemini_model = genai.Client(
-        api_key=api_key,
-    )
-
     # コンテキスト（プロンプト）の構築
     context = _build_context(metadata, core_data, metrics)
-    
-    # 要約を生成
-    if enable_logging:
-        logger.info("Gemini APIを呼び出し、要約を生成しています...")
-    model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
-    prompt = _generate_prompt(context=context)
-    response = gemini_model.models.generate_content(
-        model=model_name,
-        contents=prompt
-        )
-    full_text = response.text
 
-    # エビデンス理由の生成
-    evidence_reasons = {}
-    if hasattr(metrics, 'evidence') and metrics.evidence:
+    if _CONFIG.disable or _try_import_genai() is None:
         if enable_logging:
-            logger.info(f"{len(metrics.evidence)}件のエビデンス理由を生成しています...")
-        evidence_reasons = _generate_evidence_reasons(gemini_model, metrics.evidence)
+            logger.info("Geminiを使用しないため、定型の要約を使用します")
+        return AISummary(full_text=_build_fallback_summary(context, metrics), evidence_reasons={})
+
+    key_pool = _get_key_pool()
+    
+    model_name = _CONFIG.model
+    evidences = metrics.evidence or []
+
+    # 要約とエビデンス理由は互いに依存しないため、2つのAPI呼び出しを並行して待つ
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        summary_future = None
+        if _is_trivial_sprint(context):
+            # 結論が明らかなスプリントはAPIを呼ばず、定型の要約で済ませる
+            if enable_logging:
+                logger.info("小規模または完了済みのスプリントのため、定型の要約を使用します")
+        else:
+            if enable_logging:
+                logger.info("Gemini APIを呼び出し、要約を生成しています...")
+            prompt = _generate_prompt(context=context)
+            summary_future = executor.submit(_generate_summary, key_pool, model_name, prompt)
+        if evidences and enable_logging:
+            logger.info("%s件のエビデンス理由を生成しています...", len(evidences))
+        reasons_future = executor.submit(_generate_evidence_reasons, key_pool, evidences)
+        if summary_future is None:
+            full_text = _build_fallback_summary(context, metrics)
+        else:
+            try:
+                full_text = summary_future.result()
+            except Exception as e:
+                # 再試行しても生成できなかった場合も、ダッシュボードの作成は続ける
+                logger.error("AI要約の生成に失敗したため、定型の要約を使用します: %s", e)
+                full_text = _build_fallback_summary(context, metrics)
+        evidence_reasons = reasons_future.result()
 
     if enable_logging:
         logger.info("AI要約の生成が完了しました。")
@@ -14,6 +14,12 @@ Pdef render_dashboard(
 import os
 import io
 import logging
+import math
+import re
+import statistics
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
 from typing import Optional
 from PIL import Image, ImageDraw, ImageFont
 
@@ -73,7 +79,7 @@ def render_dashboard(
     
 
     if enable_logging:
-        logger.info(f"[Phase 6] 画像を生成中")
+        logger.info("[Phase 6] 画像を生成中")
 
 
     # draw_pngを呼び出し
@@ -93,7 +99,7 @@ def render_dashboard(
     #     raise DashboardError(f"ダッシュボード描画エラー: {e}") from e
     
     if enable_logging:
-        logger.info(f"[Phase 6] ダッシュボード描画が完了しました")
+        logger.info("[Phase 6] ダッシュボード描画が完了しました")
     
     return image_bytes
         
@@ -146,27 +152,25 @@ def draw_png(
     def try_load_font(size: int) -> ImageFont.ImageFont:
         # --- Bundled Font Path ---
         try:
-            from pathlib import Path
-            
             # Assumes phase6_dashboard.py is 4 levels deep from the project root
             project_root = Path(__file__).resolve().parents[4]
             font_dir = project_root / "assets" / "fonts"
             
-            logger.info(f"[Font Debug] Calculated project root: {project_root}")
-            logger.info(f"[Font Debug] Checking for fonts in: {font_dir}")
+            logger.info("[Font Debug] Calculated project root: %s", project_root)
+            logger.info("[Font Debug] Checking for fonts in: %s", font_dir)
 
             bundled_font_path_otf = font_dir / "NotoSansJP-Regular.otf"
             bundled_font_path_ttf = font_dir / "NotoSansJP-Regular.ttf"
 
-            logger.info(f"[Font Debug] Checking for OTF: {bundled_font_path_otf}")
-            logger.info(f"[Font Debug] OTF exists: {bundled_font_path_otf.exists()}")
+            logger.info("[Font Debug] Checking for OTF: %s", bundled_font_path_otf)
+            logger.info("[Font Debug] OTF exists: %s", bundled_font_path_otf.exists())
             
             if bundled_font_path_otf.exists():
                 logger.info("[Font Debug] Attempting to load OTF font.")
                 return ImageFont.truetype(str(bundled_font_path_otf), size)
 
-            logger.info(f"[Font Debug] Checking for TTF: {bundled_font_path_ttf}")
-            logger.info(f"[Font Debug] TTF exists: {bundled_font_path_ttf.exists()}")
+            logger.info("[Font Debug] Checking for TTF: %s", bundled_font_path_ttf)
+            logger.info("[Font Debug] TTF exists: %s", bundled_font_path_ttf.exists())
 
             if bundled_font_path_ttf.exists():
                 logger.info("[Font Debug] Attempting to load TTF font.")
@@ -175,7 +179,7 @@ def draw_png(
             logger.warning("[Font Debug] Bundled font not found.")
 
         except Exception as e:
-            logger.error(f"[Font Debug] Error loading bundled font: {e}", exc_info=True)
+            logger.error("[Font Debug] Error loading bundled font: %s", e, exc_info=True)
             pass
         # --- End Bundled Font Path ---
 
@@ -205,10 +209,10 @@ def draw_png(
 
         for path in candidates:
             try:
-                logger.info(f"[Font Debug] Trying system font: {path}")
+                logger.info("[Font Debug] Trying system font: %s", path)
                 return ImageFont.truetype(path, size)
             except Exception:
-                logger.warning(f"[Font Debug] Failed to load system font: {path}")
+                logger.warning("[Font Debug] Failed to load system font: %s", path)
                 continue
         
         logger.error("[Font Debug] All font loading attempts failed. Falling back to default.")
@@ -555,7 +559,6 @@ def draw_png(
         if not dt_str:
             return None
         try:
-            from datetime import datetime
             for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S"):
                 try:
                     d = datetime.strptime(dt_str, fmt)
@@ -767,8 +770,6 @@ def draw_png(
         if not per_issue:
             return y0
         # aggregate average days per status
-        sum_map: Dict[str, float] = {}
-        cnt_map: Dict[str, int] = {}
         vals_map: Dict[str, List[float]] = {}
 
         # normalize function to merge same meanings (e.g., IN_PROGRESS vs In Progress)
@@ -800,13 +801,10 @@ def draw_png(
                     d = float(days)
                 except Exception:
                     d = 0.0
-                label = norm_status(st)
-                sum_map[label] = sum_map.get(label, 0.0) + d
-                cnt_map[label] = cnt_map.get(label, 0) + 1
-                vals_map.setdefault(label, []).append(d)
-        if not sum_map:
+                vals_map.setdefault(norm_status(st), []).append(d)
+        if not vals_map:
             return y0
-        items = [(k, (sum_map[k] / max(1, cnt_map.get(k, 1)))) for k in sum_map.keys()]
+        items = [(k, sum(vals) / len(vals)) for k, vals in vals_map.items()]
         # sort by avg days desc
         items.sort(key=lambda x: -x[1])
         # limit to max statuses for display (default 6)
@@ -845,12 +843,7 @@ def draw_png(
             g.rectangle([x, y, x + cell_w - 6, y + cell_h], fill=col, outline=col_outline)
             # median label
             try:
-                vals = vals_map.get(name, [])
-                med = 0.0
-                if vals:
-                    svals = sorted(vals)
-                    m = len(svals)
-                    med = (svals[m//2] if m % 2 == 1 else (svals[m//2 - 1] + svals[m//2]) / 2.0)
+                med = statistics.median(vals_map[name])
                 g.text((x + 4, y - 14), f"{avgd:.1f}/{med:.1f}d", font=font_sm, fill=col_text)
             except Exception:
                 g.text((x + 4, y - 14), f"{avgd:.1f}d", font=font_sm, fill=col_text)
@@ -1077,7 +1070,15 @@ def draw_png(
         # find Review-like key
         if sum_map:
             # pick exact 'Review' else any containing 'Review'
-            key_candidates = [k for k in sum_map.keys() if str(k).lower() == "review"] or [k for k in sum_map.keys() if "review" in str(k).lower()]
+            exact: List[str] = []
+            partial: List[str] = []
+            for k in sum_map:
+                lowered = str(k).lower()
+                if lowered == "review":
+                    exact.append(k)
+                elif "review" in lowered:
+                    partial.append(k)
+            key_candidates = exact or partial
             if key_candidates:
                 k0 = key_candidates[0]
                 review_avg = sum_map[k0] / max(1, cnt_map.get(k0, 1))
@@ -1126,7 +1127,6 @@ def draw_png(
         remaining_days = 0
         if sprint_end:
             try:
-                from datetime import datetime, date
                 if "T" in sprint_end:
                     end_date = datetime.fromisoformat(sprint_end.replace("Z", "+00:00")).date()
                 else:
@@ -1139,7 +1139,6 @@ def draw_png(
         # 必要な日次消化数の計算
         required_daily_burn = None
         if remaining_days > 0:
-            import math
             target_remaining = max(0, int(target_done_rate * sprint_total) - sprint_done)
             required_daily_burn = math.ceil(target_remaining / remaining_days) if target_remaining > 0 else 0
         
@@ -1154,22 +1153,21 @@ def draw_png(
             per_issue = tis_data.get("perIssue", [])
             if per_issue:
                 # 各ステータスの平均滞在時間を計算
-                status_totals = {}
-                status_counts = {}
+                status_totals = Counter()
+                status_counts = Counter()
                 for issue in per_issue:
                     by_status = issue.get("byStatus", {})
                     for status, days in by_status.items():
                         try:
-                            days_float = float(days)
-                            status_totals[status] = status_totals.get(status, 0.0) + days_float
-                            status_counts[status] = status_counts.get(status, 0) + 1
+                            status_totals[status] += float(days)
                         except Exception:
                             continue
+                        status_counts[status] += 1
                 
                 # 最も時間がかかるステータスを特定
                 max_avg_days = 0.0
-                for status in status_totals:
-                    avg_days = status_totals[status] / max(1, status_counts[status])
+                for status, total_days in status_totals.items():
+                    avg_days = total_days / max(1, status_counts[status])
                     if avg_days > max_avg_days:
                         max_avg_days = avg_days
                         bottleneck_status = status
@@ -1287,10 +1285,9 @@ def draw_png(
         if overlay_enabled and isinstance(ai_text, str) and ai_text.strip():
             # Keep the full AI summary content without truncation
             try:
-                import re as _re
                 # Remove excessive whitespace but keep all content
-                ai_text = _re.sub(r"\r", "", ai_text)
-                ai_text = _re.sub(r"\n[ \t]*\n+", "\n", ai_text)
+                ai_text = re.sub(r"\r", "", ai_text)
+                ai_text = re.sub(r"\n[ \t]*\n+", "\n", ai_text)
             except Exception:
                 pass
             panel_x0 = proj_x0
@@ -1372,8 +1369,7 @@ def draw_png(
 
     # Footer timestamp (bottom-right)
     try:
-        import datetime as _dt
-        ts = _dt.datetime.now().strftime("生成: %Y/%m/%d %H:%M")
+        ts = datetime.now().strftime("生成: %Y/%m/%d %H:%M")
         tw = g.textlength(ts, font=font_sm)
         g.text((W - padding - tw, H - padding - getattr(font_sm, "size", 12)), ts, font=font_sm, fill=(120, 120, 120))
     except Exception:
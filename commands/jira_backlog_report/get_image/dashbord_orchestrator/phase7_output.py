@@ -58,7 +58,7 @@ def generate_markdown_report(
         OutputError: ファイル書き込みに失敗した場合
     """
     if enable_logging:
-        logger.info(f"[Phase 7] Markdownレポートを生成中: {output_path}")
+        logger.info("[Phase 7] Markdownレポートを生成中: %s", output_path)
     
     try:
         ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -241,7 +241,7 @@ def generate_markdown_report(
             f.write("\n".join(md))
         
         if enable_logging:
-            logger.info(f"[Phase 7] Markdownレポートを生成しました: {output_path}")
+            logger.info("[Phase 7] Markdownレポートを生成しました: %s", output_path)
     
     except Exception as e:
         raise OutputError(f"Markdownレポート生成エラー: {e}") from e
@@ -266,7 +266,7 @@ def export_tasks_json(
         OutputError: ファイル書き込みに失敗した場合
     """
     if enable_logging:
-        logger.info(f"[Phase 7] タスクJSONをエクスポート中: {output_path}")
+        logger.info("[Phase 7] タスクJSONをエクスポート中: %s", output_path)
     
     try:
         enriched = {
@@ -283,7 +283,7 @@ def export_tasks_json(
             json.dump(enriched, f, ensure_ascii=False, indent=2)
         
         if enable_logging:
-            logger.info(f"[Phase 7] タスクJSONをエクスポートしました: {output_path}")
+            logger.info("[Phase 7] タスクJSONをエクスポートしました: %s", output_path)
     
     except Exception as e:
         raise OutputError(f"タスクJSONエクスポートエラー: {e}") from e
@@ -312,7 +312,7 @@ def export_metrics_json(
         OutputError: ファイル書き込みに失敗した場合
     """
     if enable_logging:
-        logger.info(f"[Phase 7] メトリクスJSONをエクスポート中: {output_path}")
+        logger.info("[Phase 7] メトリクスJSONをエクスポート中: %s", output_path)
     
     try:
         metrics_data = {
@@ -342,7 +342,7 @@ def export_metrics_json(
             json.dump(metrics_data, f, ensure_ascii=False, indent=2)
         
         if enable_logging:
-            logger.info(f"メトリクスJSONをエクスポートしました: {output_path}")
+            logger.info("メトリクスJSONをエクスポートしました: %s", output_path)
     
     except Exception as e:
         raise OutputError(f"メトリクスJSONエクスポートエラー: {e}") from e
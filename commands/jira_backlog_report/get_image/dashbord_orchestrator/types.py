@@ -1,6 +1,9 @@
 """Type definitions for dashboard generation."""
+import os
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List
+from functools import cached_property
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Mapping
 from requests.auth import HTTPBasicAuth
 
 
@@ -33,46 +36,49 @@ class EnvironmentConfig:
     dashboard_log: bool = True
     
     @classmethod
-    def from_env(cls) -> Optional['EnvironmentConfig']:
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> Optional['EnvironmentConfig']:
         """環境変数から設定を読み込む
         
+        Args:
+            env: 環境変数のスナップショット（省略時は os.environ を参照）
+        
         Returns:
             EnvironmentConfig または None（必須変数が不足している場合）
         """
-        import os
+        if env is None:
+            env = os.environ
         
         # 必須環境変数のチェック
-        jira_domain = os.getenv("JIRA_DOMAIN", "").rstrip("/")
-        jira_email = os.getenv("JIRA_EMAIL")
-        jira_api_token = os.getenv("JIRA_API_TOKEN")
+        jira_domain = env.get("JIRA_DOMAIN", "").rstrip("/")
+        jira_email = env.get("JIRA_EMAIL")
+        jira_api_token = env.get("JIRA_API_TOKEN")
         
         if not all([jira_domain, jira_email, jira_api_token]):
             return None
         
         # 出力ディレクトリの決定
-        from pathlib import Path
-        output_dir = os.getenv("OUTPUT_DIR")
+        output_dir = env.get("OUTPUT_DIR")
         if not output_dir:
             # デフォルトは main.py のあるディレクトリ
             output_dir = str(Path(__file__).resolve().parent.parent)
         
         # オプション環境変数の取得
         try:
-            target_done_rate = float(os.getenv("TARGET_DONE_RATE", "0.8"))
+            target_done_rate = float(env.get("TARGET_DONE_RATE", "0.8"))
         except (ValueError, TypeError):
             target_done_rate = 0.8
         
-        axis_mode = os.getenv("AXIS_MODE", "percent").lower()
+        axis_mode = env.get("AXIS_MODE", "percent").lower()
         
         # AI設定
-        gemini_api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-        gemini_disable = os.getenv("GEMINI_DISABLE", "").lower() in ("1", "true", "yes")
+        gemini_api_key = env.get("GEMINI_API_KEY") or env.get("GOOGLE_API_KEY")
+        gemini_disable = env.get("GEMINI_DISABLE", "").lower() in ("1", "true", "yes")
         
         # ログ設定
-        dashboard_log = os.getenv("DASHBOARD_LOG", "1").lower() in ("1", "true", "yes")
+        dashboard_log = env.get("DASHBOARD_LOG", "1").lower() in ("1", "true", "yes")
         
         try:
-            evidence_top_n = int(os.getenv("EVIDENCE_TOP_N", "5"))
+            evidence_top_n = int(env.get("EVIDENCE_TOP_N", "5"))
         except (ValueError, TypeError):
             evidence_top_n = 5
         
@@ -83,16 +89,16 @@ class EnvironmentConfig:
             output_dir=output_dir,
             target_done_rate=target_done_rate,
             axis_mode=axis_mode,
-            jira_board_id=os.getenv("JIRA_BOARD_ID"),
-            jira_project_key=os.getenv("JIRA_PROJECT_KEY"),
-            n_sprints=os.getenv("N_SPRINTS", "6"),
-            status_counts_mode=os.getenv("STATUS_COUNTS_MODE", "approx"),
-            tis_unit=os.getenv("TIS_UNIT", "days"),
-            due_soon_days=os.getenv("DUE_SOON_DAYS", "7"),
-            high_priorities=os.getenv("HIGH_PRIORITIES", "Highest,High"),
+            jira_board_id=env.get("JIRA_BOARD_ID"),
+            jira_project_key=env.get("JIRA_PROJECT_KEY"),
+            n_sprints=env.get("N_SPRINTS", "6"),
+            status_counts_mode=env.get("STATUS_COUNTS_MODE", "approx"),
+            tis_unit=env.get("TIS_UNIT", "days"),
+            due_soon_days=env.get("DUE_SOON_DAYS", "7"),
+            high_priorities=env.get("HIGH_PRIORITIES", "Highest,High"),
             evidence_top_n=evidence_top_n,
             gemini_api_key=gemini_api_key,
-            gemini_model=os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite"),
+            gemini_model=env.get("GEMINI_MODEL", "gemini-2.5-flash-lite"),
             gemini_disable=gemini_disable,
             dashboard_log=dashboard_log,
         )
@@ -109,7 +115,7 @@ class AuthContext:
         return f"AuthContext(domain={self.domain}, auth=***)"
 
 
-@dataclass
+@dataclass(slots=True)
 class BoardMetadata:
     """ボード情報"""
     board: Dict[str, Any]
@@ -128,7 +134,7 @@ class BoardMetadata:
         return self.board.get("type", "unknown")
 
 
-@dataclass
+@dataclass(slots=True)
 class SprintMetadata:
     """スプリント情報"""
     sprint: Optional[Dict[str, Any]]
@@ -200,7 +206,7 @@ class TaskTotals:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SubtaskData:
     """サブタスク情報"""
     key: str
@@ -214,6 +220,9 @@ class SubtaskData:
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     due_date: Optional[str] = None
+    status_category: Optional[str] = None
+    # サブタスク自身に担当者が設定されていないか（assignee は親タスクの担当者で補完されるため別に持つ）
+    unassigned: bool = False
     
     # 後方互換性のためのプロパティ
     @property
@@ -238,7 +247,7 @@ class SubtaskData:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ParentTask:
     """親タスク情報"""
     key: str
@@ -299,6 +308,18 @@ class CoreData:
         
         return cls(parents=parents, totals=totals)
     
+    @cached_property
+    def assignees(self) -> List[str]:
+        """サブタスク担当者の一覧（重複なし・名前順）。初回参照時に一度だけ集計する"""
+        names = set()
+        add = names.add
+        for parent in self.parents:
+            for subtask in parent.subtasks:
+                assignee = subtask.assignee
+                if assignee:
+                    add(assignee)
+        return sorted(names)
+    
     def to_dict(self) -> Dict[str, Any]:
         """辞書形式に変換（既存形式との互換性）"""
         return {
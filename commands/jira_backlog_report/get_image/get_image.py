@@ -12,11 +12,14 @@ def run_dashboard_generation(enable_logging: bool = True) -> int:
         int: 終了コード（0=成功、1=失敗）
     """
     try:
+        # サブプロセスを起動せず、同一プロセス内でオーケストレーターを実行する
         orchestrator = DashboardOrchestrator(enable_logging=enable_logging)
-        image_path = orchestrator.run()
+        image_bytes = orchestrator.run()
+        if image_bytes is None:
+            return 1
         
-        # 画像パスを出力（既存のmain.pyとの互換性）
-        print(str(image_path))
+        if enable_logging:
+            print(f"✅ Dashboard image generated ({len(image_bytes)} bytes)")
         
         return 0
     
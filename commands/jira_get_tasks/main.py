@@ -6,14 +6,14 @@ from util.request_jira import RequestJiraRepository
 
 import os
 import sys
-import json
 import re
+import orjson
 from google import genai
 from google.genai import types
 
-from dotenv import load_dotenv
+from util.dotenv_loader import ensure_env_loaded
 
-load_dotenv()
+ensure_env_loaded()
 
 class CommandJiraGetTasksRepository:
     
@@ -43,7 +43,7 @@ class CommandJiraGetTasksRepository:
             # return responce.text
             clean_json_str = re.search(r"\{.*\}", responce.text, re.DOTALL).group(0)
             
-            gemini_result = json.loads(clean_json_str)
+            gemini_result = orjson.loads(clean_json_str)
             print(f"gemini result: \n{gemini_result}")
             # return responce_result
             try:
@@ -1,9 +1,9 @@
 import os
 from jira import JIRA
 
-from dotenv import load_dotenv
+from util.dotenv_loader import ensure_env_loaded
 
-load_dotenv()
+ensure_env_loaded()
 
 class RequestJqlRepository:
     def __init__(self):
@@ -23,9 +23,9 @@ def register_events(app):
                 say(
                     text=f"こんにちは <@{user_id}> さん！「{text}」とメッセージを送りましたね。"
                 )
-                logger.info(f"DMに応答しました (ユーザー: {user_id})")
+                logger.info("DMに応答しました (ユーザー: %s)", user_id)
 
             except Exception as e:
-                logger.error(f"応答中にエラーが発生しました: {e}")
+                logger.error("応答中にエラーが発生しました: %s", e)
 
 
@@ -3,7 +3,7 @@
 import os
 import sys
 import base64
-import json
+import orjson
 from slack_bolt import App
 from slack_bolt.adapter.google_cloud_functions import SlackRequestHandler
 from google.cloud import firestore
@@ -13,9 +13,9 @@ import events
 
 import scheduler
 
-from dotenv import load_dotenv
+from util.dotenv_loader import ensure_env_loaded
 
-load_dotenv()
+ensure_env_loaded()
 
 
 slack_bot_token = os.environ.get("SLACK_BOT_TOKEN")
@@ -45,8 +45,8 @@ slack_handler = SlackRequestHandler(app)
 def handle_pubsub_message(data: dict):
     """Pub/Subメッセージをデコードし、タスクハンドラに処理を委譲する"""
     try:
-        message_data_str = base64.b64decode(data["message"]["data"]).decode("utf-8")
-        message_data = json.loads(message_data_str)
+        # orjsonはbytesを直接受け取れるため、str へのデコードを挟まない
+        message_data = orjson.loads(base64.b64decode(data["message"]["data"]))
         print(f"Pub/Subからメッセージを受信しました: {message_data}")
 
 
@@ -53,8 +53,16 @@ class DailyTaskReccomendation:
                     if jira_results:
                         today = date.today().isoformat()
 
+                        # 今日が期限のタスクとそれ以外を1回の走査で振り分ける
+                        tasks_due_today = []
+                        remaining_tasks = []
+                        for issue in jira_results:
+                            if issue.fields.duedate == today:
+                                tasks_due_today.append(issue)
+                            else:
+                                remaining_tasks.append(issue)
+
                         # カテゴリ1: 今日が期限のタスク
-                        tasks_due_today = [issue for issue in jira_results if issue.fields.duedate and issue.fields.duedate == today]
                         blocks.append({"type": "header", "text": {"type": "plain_text", "text": "今日が期限のタスク"}})
                         if tasks_due_today:
                             found_any_tasks = True
@@ -69,9 +77,6 @@ class DailyTaskReccomendation:
                                 }
                             })
 
-                        # 残りのタスク（今日が期限のものを除く）
-                        remaining_tasks = [issue for issue in jira_results if not (issue.fields.duedate and issue.fields.duedate == today)]
-
                         # カテゴリ2: 優先度の高いタスク
                         def priority_sort_key(issue):
                             if issue.fields.priority:
@@ -1,4 +1,9 @@
+import sys
+from collections import Counter
 from datetime import datetime, timedelta
+
+import orjson
+
 from util.request_jira import RequestJiraRepository
 from util.get_slack_data import GetSlackData
 
@@ -19,56 +24,23 @@ class WeeklyAggregateAward:
         # ご利用のJira環境に合わせてIDを変更してください。
         story_point_field_id = 'customfield_10016'
 
+        user_emails = []
         for user_doc in users_ref:
             user_data = user_doc.to_dict()
             user_email = user_data.get("jira_email")
 
             if not user_email:
                 continue
+            user_emails.append(user_email)
 
-            # 先週完了したタスクを取得するJQL
-            jql_query = (
-                f'assignee = "{user_email}" AND '
-                f'status = "完了" AND '
-                f'resolved >= startOfWeek(-1) AND resolved <= endOfWeek(-1)'
+        issues_by_email = self._fetch_completed_issues_by_assignee(jira_repo, user_emails)
+
+        for user_email in user_emails:
+            weekly_completed_tasks[user_email] = self._summarize_completed_issues(
+                issues_by_email.get(user_email) or [],
+                story_point_field_id,
             )
 
-            # JQLを実行して課題を検索
-            searched_issues = jira_repo.request_jql(jql_query)
-
-            total_completed = 0
-            on_time_completed = 0
-            total_story_points = 0
-            completed_by_size = {}
-
-            if searched_issues:
-                total_completed = len(searched_issues)
-                for issue in searched_issues:
-                    # 期日内完了のチェック
-                    due_date_str = issue.fields.duedate
-                    resolution_date_str = issue.fields.resolutiondate
-                    if due_date_str and resolution_date_str:
-                        resolution_date = datetime.strptime(resolution_date_str, '%Y-%m-%dT%H:%M:%S.%f%z').date()
-                        due_date = datetime.strptime(due_date_str, '%Y-%m-%d').date()
-                        if resolution_date <= due_date:
-                            on_time_completed += 1
-                    
-                    # ストーリーポイントの集計
-                    story_points = getattr(issue.fields, story_point_field_id, None)
-                    if isinstance(story_points, (int, float)):
-                        total_story_points += story_points
-                    
-                    # タスクサイズごとの集計
-                    size_key = str(story_points) if story_points is not None else 'None'
-                    completed_by_size[size_key] = completed_by_size.get(size_key, 0) + 1
-
-            weekly_completed_tasks[user_email] = {
-                'total': total_completed,
-                'on_time': on_time_completed,
-                'total_story_points': total_story_points,
-                'by_size': completed_by_size
-            }
-        
         # 集計結果を合計完了数が多い順にソート
         sorted_users = sorted(weekly_completed_tasks.items(), key=lambda item: item[1]['total'], reverse=True)
 
@@ -76,8 +48,10 @@ class WeeklyAggregateAward:
         formated_blocks = self.aggregate_award_formated_slack_blocks(sorted_users)
 
         # Blockをコンソールに出力（デバッグ用）
-        import json
-        print(json.dumps(formated_blocks, indent=4, ensure_ascii=False))
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(formated_blocks, option=orjson.OPT_INDENT_2))
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
 
         get_slack_data = GetSlackData()
 
@@ -94,6 +68,85 @@ class WeeklyAggregateAward:
         return
 
 
+    def _fetch_completed_issues_by_assignee(self, jira_repo, user_emails):
+        """
+        先週完了したタスクを1回のJQLでまとめて取得し、担当者のメールアドレスごとに振り分ける
+        """
+        # 先週完了したタスクを取得するJQLの共通部分
+        completed_last_week = (
+            'status = "完了" AND '
+            'resolved >= startOfWeek(-1) AND resolved <= endOfWeek(-1)'
+        )
+        issues_by_email = {email: [] for email in user_emails}
+        if not user_emails:
+            return issues_by_email
+
+        assignees = ", ".join(f'"{email}"' for email in user_emails)
+        searched_issues = jira_repo.request_jql(f'assignee in ({assignees}) AND {completed_last_week}')
+
+        if searched_issues is not None:
+            email_lookup = {email.lower(): email for email in user_emails}
+            grouped = True
+            for issue in searched_issues:
+                assignee = issue.fields.assignee
+                email = email_lookup.get((getattr(assignee, "emailAddress", None) or "").lower())
+                if email is None:
+                    # メールアドレスが非公開の担当者がいると振り分けられないため、個別取得に切り替える
+                    grouped = False
+                    break
+                issues_by_email[email].append(issue)
+            if grouped:
+                return issues_by_email
+
+        # フォールバック: ユーザーごとにJQLを実行して課題を検索
+        for email in user_emails:
+            issues_by_email[email] = jira_repo.request_jql(
+                f'assignee = "{email}" AND {completed_last_week}'
+            ) or []
+        return issues_by_email
+
+    def _summarize_completed_issues(self, searched_issues, story_point_field_id):
+        """
+        完了タスクの件数・期日内完了数・ストーリーポイント・サイズ別件数を集計する
+        """
+        total_completed = 0
+        on_time_completed = 0
+        total_story_points = 0
+        completed_by_size = Counter()
+
+        if searched_issues:
+            total_completed = len(searched_issues)
+            # ループ内の属性探索を避けるためローカルに束縛
+            strptime = datetime.strptime
+            size_keys = []
+            add_size_key = size_keys.append
+            for issue in searched_issues:
+                fields = issue.fields
+                # 期日内完了のチェック
+                due_date_str = fields.duedate
+                resolution_date_str = fields.resolutiondate
+                if due_date_str and resolution_date_str:
+                    resolution_date = strptime(resolution_date_str, '%Y-%m-%dT%H:%M:%S.%f%z').date()
+                    due_date = strptime(due_date_str, '%Y-%m-%d').date()
+                    if resolution_date <= due_date:
+                        on_time_completed += 1
+                
+                # ストーリーポイントの集計
+                story_points = getattr(fields, story_point_field_id, None)
+                if isinstance(story_points, (int, float)):
+                    total_story_points += story_points
+                
+                # タスクサイズごとの集計
+                add_size_key(str(story_points) if story_points is not None else 'None')
+            completed_by_size.update(size_keys)
+
+        return {
+            'total': total_completed,
+            'on_time': on_time_completed,
+            'total_story_points': total_story_points,
+            'by_size': dict(completed_by_size)
+        }
+
     def aggregate_award_formated_slack_blocks(self, sorted_users):
         blocks = [
             {
@@ -0,0 +1,13 @@
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=1)
+def ensure_env_loaded():
+    """
+    .env を環境変数へ読み込む（プロセス内で1回だけ実行される）
+
+    各モジュールの import 時に呼ばれるため、2回目以降はキャッシュを返すだけにする。
+    """
+    return load_dotenv()
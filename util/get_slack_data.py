@@ -3,9 +3,9 @@ from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
 
-from dotenv import load_dotenv
+from util.dotenv_loader import ensure_env_loaded
 
-load_dotenv()
+ensure_env_loaded()
 
 
 class GetSlackData:
@@ -0,0 +1,78 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import orjson
+
+
+# Cloud Functions では /tmp 以外に書き込めないため、既定はOSの一時ディレクトリ配下に置く
+_CACHE_ROOT = Path(os.getenv("JIRA_TO_SLACK_CACHE_DIR") or Path(tempfile.gettempdir()) / "jira_to_slack")
+
+
+def _cache_path(namespace, key):
+    digest = hashlib.sha1(str(key).encode("utf-8")).hexdigest()
+    return _CACHE_ROOT / namespace / f"{digest}.json"
+
+
+def load(namespace, key, ttl_sec):
+    """
+    キャッシュから値を読み込む
+
+    Args:
+        namespace: キャッシュの種類（サブディレクトリ名）
+        key: キャッシュキー（文字列化してハッシュする）
+        ttl_sec: 有効期間（秒）。0以下なら常にNoneを返す
+
+    Returns:
+        キャッシュされた値。未保存・期限切れ・読み込み失敗時はNone
+    """
+    if ttl_sec <= 0:
+        return None
+    path = _cache_path(namespace, key)
+    try:
+        entry = orjson.loads(path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if time.time() - entry.get("saved_at", 0) > ttl_sec:
+        return None
+    return entry.get("value")
+
+
+def save(namespace, key, value):
+    """
+    値をキャッシュに保存する（一時ファイルに書いてから置き換えるため、読み込み側が壊れた内容を見ることはない）
+
+    Args:
+        namespace: キャッシュの種類（サブディレクトリ名）
+        key: キャッシュキー
+        value: JSONに変換可能な値
+    """
+    path = _cache_path(namespace, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps({"saved_at": time.time(), "value": value}))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, TypeError) as e:
+        print(f"⚠️ キャッシュの保存に失敗しました: {e}")
+
+
+def invalidate(namespace, key):
+    """キャッシュを削除する（存在しなければ何もしない）"""
+    try:
+        _cache_path(namespace, key).unlink()
+    except OSError:
+        pass
+
+
+def clear(namespace):
+    """指定した種類のキャッシュをすべて削除する"""
+    shutil.rmtree(_CACHE_ROOT / namespace, ignore_errors=True)
@@ -1,10 +1,66 @@
 import os
+import re
+import threading
+import time
+from functools import lru_cache
+
+import orjson
 from jira import JIRA, JIRAError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 
-from dotenv import load_dotenv
+from util.dotenv_loader import ensure_env_loaded
+
+ensure_env_loaded()
+
+# カンバンボード等でスプリントAPIを呼んだ際のエラーメッセージ（英語/日本語）
+_SPRINT_UNSUPPORTED_RE = re.compile(r'does not support sprints|スプリントをサポートしません', re.IGNORECASE)
+
+
+class _RateLimiter:
+    """1秒あたりのリクエスト数を上限以下に保つ（複数スレッドから呼ばれても送信間隔を均等にする）"""
+
+    def __init__(self, requests_per_second):
+        self._interval = 1.0 / requests_per_second
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+# Jiraサーバーごとの /search/approximate-count 対応可否（未確認のサーバーは含まない）
+# 未対応のインスタンスで毎回失敗する呼び出しを繰り返さないよう、プロセス内で結果を共有する
+_APPROXIMATE_COUNT_SUPPORT = {}
+
+# エンドポイント自体が存在しないことを示すステータスコード（一時的な失敗では未対応と判断しない）
+_UNSUPPORTED_STATUS_CODES = frozenset({404, 405, 501})
+
+
+@lru_cache(maxsize=None)
+def _get_rate_limiter(requests_per_second):
+    # レート制限はアカウント単位のため、同じ上限のリポジトリ同士で1つのリミッターを共有する
+    return _RateLimiter(requests_per_second)
+
+
+class _ThrottledHTTPAdapter(HTTPAdapter):
+    """送信前にレートリミッターで待機する HTTPAdapter（リミッター未指定時は通常の HTTPAdapter と同じ）"""
+
+    def __init__(self, rate_limiter=None, **kwargs):
+        self._rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self._rate_limiter is not None:
+            self._rate_limiter.wait()
+        return super().send(request, **kwargs)
 
-load_dotenv()
 
 class RequestJiraRepository:
     def __init__(self):
@@ -17,15 +73,55 @@ class RequestJiraRepository:
             self.sp_env = os.getenv("JIRA_STORY_POINTS_FIELD")
         except Exception as e:
             print(f"error: {e}")
+        # ボード/スプリント/フィールド定義はほぼ静的なため、インスタンス内でキャッシュする
+        self._board_cache = {}
+        self._active_sprint_cache = {}
+        self._story_point_field_cache = None
         try:
+            try:
+                timeout = float(os.getenv("JIRA_TIMEOUT", "30"))
+                max_retries = max(0, int(os.getenv("JIRA_MAX_RETRIES", "3")))
+            except ValueError:
+                timeout, max_retries = 30.0, 3
             # メールアドレスとAPIトークンで認証し、Jiraに接続
+            # 429/5xx のリトライ(Retry-After 尊重・指数バックオフ)は jira 側の ResilientSession が担う
             self.jira_client = JIRA(
                 server=JIRA_SERVER, 
                 basic_auth=(
                     JIRA_EMAIL, 
                     JIRA_API_TOKEN
-                )
+                ),
+                timeout=timeout,
+                max_retries=max_retries,
+            )
+            # 並列取得時にコネクションを使い回せるよう、プールサイズを広げる(既定は10)
+            # 接続確立の失敗のみ、ジッター付きバックオフで urllib3 側でも再試行する
+            try:
+                pool_size = max(1, int(os.getenv("JIRA_POOL_MAXSIZE", "32")))
+            except ValueError:
+                pool_size = 32
+            connect_retry = Retry(
+                total=None,
+                connect=3,
+                read=0,
+                status=0,
+                backoff_factor=0.5,
+                backoff_jitter=0.3,
+            )
+            # JIRA_API_RPS を指定した場合は、全フェーズのリクエストをその秒間件数以下に抑える
+            # (429 を受けてから待つより、送信側で間隔を空けた方が結果的に速いことがある)
+            try:
+                api_rps = float(os.getenv("JIRA_API_RPS", "0"))
+            except ValueError:
+                api_rps = 0.0
+            adapter = _ThrottledHTTPAdapter(
+                rate_limiter=_get_rate_limiter(api_rps) if api_rps > 0 else None,
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=connect_retry,
             )
+            self.jira_client._session.mount("https://", adapter)
+            self.jira_client._session.mount("http://", adapter)
             print("✅ 認証に成功しました。")
         except Exception as e:
             print(f"❌ 認証に失敗しました: {e}")
@@ -43,6 +139,68 @@ class RequestJiraRepository:
             print(f"❌ JQLの実行に失敗しました: {e}")
             return None
     
+    def count_jql(self, query, batch=5000):
+        """JQLに一致する課題数を返す（失敗時はNone）。
+
+        まず /search/approximate-count で1回の呼び出しで件数を得る。
+        未対応のインスタンス(Server/DC など)では課題を辿って数える。
+        未対応と判明したサーバーでは、以降 approximate-count を呼ばずに直接辿る。
+        """
+        server = self.jira_client.server_url
+        if _APPROXIMATE_COUNT_SUPPORT.get(server, True):
+            try:
+                count = self.jira_client.approximate_issue_count(query)
+                _APPROXIMATE_COUNT_SUPPORT[server] = True
+                return count
+            except JIRAError as e:
+                if e.status_code in _UNSUPPORTED_STATUS_CODES:
+                    _APPROXIMATE_COUNT_SUPPORT[server] = False
+                print(f"⚠️ approximate-count が利用できないため、課題を辿って件数を数えます: {e}")
+            except Exception as e:
+                print(f"⚠️ approximate-count が利用できないため、課題を辿って件数を数えます: {e}")
+        return self._count_by_walk(query, batch=batch)
+
+    def _count_by_walk(self, query, batch=5000):
+        """/search/jql を id のみで辿りながら件数を数える（失敗時はNone）。
+
+        取得フィールドを絞ると1ページあたりの上限が大きくなり、往復回数を抑えられる。
+        """
+        try:
+            return sum(1 for _ in self.iter_jql(query, fields=["id"], batch=batch))
+        except Exception as e:
+            print(f"❌ 件数の取得に失敗しました: {e}")
+            return None
+
+    def iter_jql(self, query, fields="*all", batch=100, expand=None):
+        """JQLの検索結果を課題ごとの生dictで1件ずつ返すジェネレーター。
+
+        Jira Cloud の /search/jql を nextPageToken で辿り、ページ単位で取得する。
+        全件をリストに溜めないため、消費し終えたページはすぐに解放される。
+        expand に "changelog" などを指定すると各課題に展開結果が含まれる。
+        """
+        # changelog 展開時はレスポンスが大きくなるため、enhanced_search_issues を経由せず
+        # セッションで直接取得して orjson でデコードする(リトライ・エラー変換は ResilientSession 側)
+        url = self.jira_client._get_url("search/jql")
+        session = self.jira_client._session
+        params = {
+            "jql": query,
+            "fields": fields.split(",") if isinstance(fields, str) else (fields or ["*all"]),
+            "expand": expand,
+            "maxResults": batch,
+        }
+        seen_tokens = set()
+        while True:
+            data = orjson.loads(session.get(url, params=params).content)
+            issues = data.get("issues") or []
+            yield from issues
+            next_page_token = data.get("nextPageToken")
+            params["nextPageToken"] = next_page_token
+            # 件数(total)は返らないため、isLast・トークン・空ページで終端を判定する
+            # (サーバー側で maxResults が切り詰められるため「要求より少ない件数」では判定しない)
+            if not issues or data.get("isLast") or not next_page_token or next_page_token in seen_tokens:
+                return
+            seen_tokens.add(next_page_token)
+
     def get_issue(self, issue_key, fields=None, expand=None):
         return self.jira_client.issue(issue_key, fields=fields, expand=expand)
     
@@ -274,46 +432,68 @@ class RequestJiraRepository:
 
 
     def get_scrum_board(self, board_id = 1):
+        if board_id in self._board_cache:
+            return self._board_cache[board_id]
         print("\n🔎 Scrumボードを検索中...")
         all_boards = self.jira_client.boards()
         print(all_boards)
-        scrum_board = None
+        # 一覧取得のついでに全ボードをキャッシュしておく
         for board in all_boards:
-            # print(board.raw.get("id"))
-            if board.raw.get("id") == board_id:
-                scrum_board = board
-                return scrum_board.raw
-        
+            self._board_cache[board.raw.get("id")] = board.raw
+        scrum_board = self._board_cache.get(board_id)
         if not scrum_board:
             print("❌ Scrumタイプのボードが見つかりませんでした。")
             return None
+        return scrum_board
         
 
     def get_board_active_sprint(self, board_id):
+        if board_id in self._active_sprint_cache:
+            return self._active_sprint_cache[board_id]
         print("\n🔎 アクティブなスプリントを検索中...")
-        active_sprints = self.jira_client.sprints(board_id=board_id, state='active')
+        try:
+            active_sprints = self.jira_client.sprints(board_id=board_id, state='active')
+        except JIRAError as e:
+            if _SPRINT_UNSUPPORTED_RE.search(e.text or ""):
+                print(f"❌ ボード {board_id} はスプリントをサポートしていません。")
+                self._active_sprint_cache[board_id] = None
+                return None
+            raise
         if active_sprints:
-            return active_sprints[0].raw
+            active_sprint = active_sprints[0].raw
         else:
             print("❌ アクティブなスプリントはありませんでした。")
-            return None
+            active_sprint = None
+        self._active_sprint_cache[board_id] = active_sprint
+        return active_sprint
 
     def get_story_point_field(self):
+        if self._story_point_field_cache is not None:
+            return self._story_point_field_cache
+        # 環境変数で明示されていればフィールド一覧の取得を省略する
+        if self.sp_env:
+            self._story_point_field_cache = self.sp_env
+            return self.sp_env
         print("\n🔎 ストーリーポイントフィールドを検索中...")
         all_fields = self.jira_client.fields()
+        story_points_field_id = None
         for field in all_fields:
             if field.get("schema", {}).get("custom") == "com.pyxis.greenhopper.jira:jsw-story-points":
                 story_points_field_id = field["id"]
                 break
+        if story_points_field_id:
+            self._story_point_field_cache = story_points_field_id
+        return story_points_field_id
 
     def get_sprint(self, board_id, state=None, maxResults=200):
 
         try:
-            # sprints()メソッドを呼び出し、state='closed'を指定
+            # sprints()メソッドを呼び出し、stateで絞り込み
+            # ページングはjira側(_fetch_pages)がisLastを見て打ち切るため、取得上限のみ指定する
             closed_sprints = self.jira_client.sprints(
                 board_id=board_id,
                 state=state,
-                maxResults=200
+                maxResults=maxResults
             )
             
             print(f"✅ ボードID '{board_id}' の完了済みスプリントを {len(closed_sprints)} 件取得しました。")
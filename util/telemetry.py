@@ -0,0 +1,79 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import orjson
+
+
+# json_cache と同じ置き場所（Cloud Functions では /tmp 以外に書き込めない）
+_TELEMETRY_PATH = Path(os.getenv("JIRA_TO_SLACK_CACHE_DIR") or Path(tempfile.gettempdir()) / "jira_to_slack") / "telemetry.jsonl"
+
+_write_lock = threading.Lock()
+
+
+def log_event(kind, **fields):
+    """
+    計測イベントを1行のJSONとして追記する
+
+    Args:
+        kind: イベントの種類
+        fields: 記録する値（JSONに変換できない値は文字列にする）
+    """
+    record = {"ts": time.time(), "kind": kind, **fields}
+    try:
+        line = orjson.dumps(record, default=str) + b"\n"
+        with _write_lock:
+            _TELEMETRY_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(_TELEMETRY_PATH, "ab") as f:
+                f.write(line)
+    except (OSError, TypeError) as e:
+        print(f"⚠️ 計測ログの書き込みに失敗しました: {e}")
+
+
+def _percentile(sorted_values, ratio):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(ratio * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(path=None):
+    """
+    計測ログを種類ごとに集計する
+
+    Returns:
+        {種類: {"count", "cached", "hit_rate", "latency_p50_ms", "latency_p95_ms"}} の辞書
+    """
+    events = {}
+    try:
+        with open(path or _TELEMETRY_PATH, "rb") as f:
+            for line in f:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                events.setdefault(record.get("kind"), []).append(record)
+    except OSError:
+        return {}
+
+    summary = {}
+    for kind, records in events.items():
+        latencies = sorted(r["latency_ms"] for r in records if isinstance(r.get("latency_ms"), (int, float)))
+        cached = sum(1 for r in records if r.get("cached"))
+        summary[kind] = {
+            "count": len(records),
+            "cached": cached,
+            "hit_rate": round(cached / len(records), 3),
+            "latency_p50_ms": _percentile(latencies, 0.5),
+            "latency_p95_ms": _percentile(latencies, 0.95),
+        }
+    return summary
+
+
+if __name__ == "__main__":
+    # python -m util.telemetry [path]
+    for kind, stats in sorted(summarize(sys.argv[1] if len(sys.argv) > 1 else None).items()):
+        print(f"{kind}: {stats}")